@@ -2,6 +2,7 @@
 from __future__ import absolute_import, print_function, unicode_literals
 
 from _Framework.ControlSurface import ControlSurface
+import codecs
 import socket
 import json
 import struct
@@ -18,6 +19,8 @@ except ImportError:
 # Constants for socket communication
 DEFAULT_PORT = 9877
 HOST = "localhost"
+RECV_BUFFER_SIZE = 65536  # initial per-client receive buffer, grown as needed
+SOCKET_BUFFER_SIZE = 1 << 20  # kernel send/receive buffers for client sockets
 
 
 class CommandRegistry(object):
@@ -50,13 +53,77 @@ class CommandRegistry(object):
 commands = CommandRegistry()
 
 
+# MIDI note fields in wire order, with the defaults used when omitted
+NOTE_FIELDS = (
+    ("pitch", 60),
+    ("start_time", 0.0),
+    ("duration", 0.25),
+    ("velocity", 100),
+    ("mute", False),
+)
+
+
 # Length-prefixed protocol functions
 # Protocol: 4-byte big-endian length prefix + UTF-8 JSON payload
 
+# 4-byte big-endian length prefix, compiled once
+_LEN = struct.Struct('>I')
+
+
+# Frames per sendmsg call; two buffers each, within the usual IOV_MAX of 1024
+_FRAMES_PER_SEND = 512
+
+
+def _send_frames(sock, payloads):
+    """Send encoded payloads as length-prefixed frames.
+
+    Headers and payloads go out together in scatter-gather sendmsg calls
+    where available, without concatenating them first.
+    """
+    for start in range(0, len(payloads), _FRAMES_PER_SEND):
+        buffers = []
+        for payload in payloads[start:start + _FRAMES_PER_SEND]:
+            buffers.append(_LEN.pack(len(payload)))
+            buffers.append(payload)
+        if not hasattr(sock, 'sendmsg'):
+            sock.sendall(b''.join(buffers))
+            continue
+        sent = sock.sendmsg(buffers)
+        # sendmsg may return after a partial write; finish with sendall
+        if sent < sum(len(b) for b in buffers):
+            sock.sendall(b''.join(buffers)[sent:])
+
+
 def send_message(sock, data):
     """Send a length-prefixed JSON message over the socket."""
-    msg = json.dumps(data).encode('utf-8')
-    sock.sendall(struct.pack('>I', len(msg)) + msg)
+    _send_frames(sock, [json.dumps(data).encode('utf-8')])
+
+
+def send_streamed(sock, response, key):
+    """Send a success response with one of its result lists streamed.
+
+    The first frame is the response with result[key] replaced by a
+    "streamed" marker giving the key and item count; each item then
+    follows as its own frame, so the client can parse items as they
+    arrive. The frames are written together in as few sends as
+    possible. Responses without a list at result[key] are sent whole.
+    """
+    result = response.get("result")
+    items = result.get(key) if isinstance(result, dict) else None
+    if response.get("status") != "success" or not isinstance(items, list):
+        send_message(sock, response)
+        return
+    head = dict(result)
+    del head[key]
+    first = {
+        "status": "success",
+        "result": head,
+        "streamed": {"key": key, "count": len(items)}
+    }
+    if "req_id" in response:
+        first["req_id"] = response["req_id"]
+    _send_frames(sock, [json.dumps(frame).encode('utf-8')
+                        for frame in [first] + items])
 
 
 def recv_exact(sock, n):
@@ -70,12 +137,36 @@ def recv_exact(sock, n):
     return data
 
 
-def recv_message(sock):
-    """Receive a length-prefixed JSON message from the socket."""
-    length_bytes = recv_exact(sock, 4)
-    length = struct.unpack('>I', length_bytes)[0]
-    data = recv_exact(sock, length)
-    return json.loads(data.decode('utf-8'))
+def recv_exact_into(sock, buffer, n):
+    """Receive exactly n bytes into the start of a preallocated buffer."""
+    view = memoryview(buffer)
+    received = 0
+    while received < n:
+        count = sock.recv_into(view[received:n])
+        if not count:
+            raise Exception("Socket closed")
+        received += count
+
+
+def recv_message(sock, buffer=None):
+    """Receive a length-prefixed JSON message from the socket.
+
+    With a reusable buffer the frame is read into it in place (growing it
+    if needed) and decoded from there, instead of concatenating a new
+    bytes object per recv call.
+    """
+    if buffer is None:
+        length = _LEN.unpack(recv_exact(sock, _LEN.size))[0]
+        data = recv_exact(sock, length)
+        return json.loads(data.decode('utf-8'))
+
+    recv_exact_into(sock, buffer, _LEN.size)
+    length = _LEN.unpack_from(buffer)[0]
+    if length > len(buffer):
+        buffer.extend(bytearray(max(length, 2 * len(buffer)) - len(buffer)))
+    recv_exact_into(sock, buffer, length)
+    return json.loads(codecs.utf_8_decode(memoryview(buffer)[:length])[0])
+
 
 def create_instance(c_instance):
     """Create and return the AbletonMCP script instance"""
@@ -136,6 +227,11 @@ class AbletonMCP(ControlSurface):
         try:
             self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            # Set on the listener so accepted sockets inherit the sizes
+            # (they must be in place before the handshake to affect the
+            # TCP window); large tree responses then need fewer sends
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
             self.server.bind((HOST, DEFAULT_PORT))
             self.server.listen(5)  # Allow up to 5 pending connections
             
@@ -160,6 +256,9 @@ class AbletonMCP(ControlSurface):
                 try:
                     # Accept connections with timeout
                     client, address = self.server.accept()
+                    # Responses are small request/response frames; don't
+                    # let Nagle hold them back waiting for an ACK
+                    client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
                     self.log_message("Connection accepted from " + str(address))
                     self.show_message("AbletonMCP: Client connected")
                     
@@ -193,20 +292,29 @@ class AbletonMCP(ControlSurface):
         """Handle communication with a connected client using length-prefixed protocol."""
         self.log_message("Client handler started")
         client.settimeout(None)  # No timeout for client socket
+        buffer = bytearray(RECV_BUFFER_SIZE)
 
         try:
             while self.running:
                 try:
                     # Receive length-prefixed message
-                    command = recv_message(client)
+                    command = recv_message(client, buffer)
 
                     self.log_message("Received command: " + str(command.get("type", "unknown")))
 
                     # Process the command and get response
                     response = self._process_command(command)
-
-                    # Send length-prefixed response
-                    send_message(client, response)
+                    # Echo the request id so the client can match responses
+                    if "req_id" in command:
+                        response["req_id"] = command["req_id"]
+
+                    # Send length-prefixed response, streaming the list
+                    # named by "stream" item by item if the client asked
+                    stream_key = command.get("stream")
+                    if stream_key:
+                        send_streamed(client, response, stream_key)
+                    else:
+                        send_message(client, response)
 
                 except Exception as e:
                     error_msg = str(e)
@@ -236,7 +344,7 @@ class AbletonMCP(ControlSurface):
                 pass
             self.log_message("Client handler stopped")
 
-    def _execute_on_main_thread(self, func):
+    def _execute_on_main_thread(self, func, timeout=10.0):
         """Execute a function on the main thread and return result."""
         response_queue = queue.Queue()
 
@@ -256,7 +364,7 @@ class AbletonMCP(ControlSurface):
             task()
 
         try:
-            return response_queue.get(timeout=10.0)
+            return response_queue.get(timeout=timeout)
         except queue.Empty:
             return {"status": "error", "message": "Timeout waiting for operation to complete"}
 
@@ -279,8 +387,12 @@ class AbletonMCP(ControlSurface):
             raise IndexError("Clip index out of range")
         return track.clip_slots[clip_index]
 
-    def _process_command(self, command):
-        """Process a command from the client using the command registry."""
+    def _process_command(self, command, on_main_thread=False):
+        """Process a command from the client using the command registry.
+
+        Main-thread commands are scheduled onto Live's main thread unless
+        the caller is already running there (on_main_thread=True).
+        """
         command_type = command.get("type", "")
         params = command.get("params", {})
 
@@ -291,7 +403,7 @@ class AbletonMCP(ControlSurface):
         handler = getattr(self, handler_name)
 
         try:
-            if commands.requires_main_thread(command_type):
+            if commands.requires_main_thread(command_type) and not on_main_thread:
                 return self._execute_on_main_thread(lambda: handler(**params))
             else:
                 return {"status": "success", "result": handler(**params)}
@@ -302,6 +414,64 @@ class AbletonMCP(ControlSurface):
     
     # Command implementations
 
+    @commands.register("batch")
+    def _batch(self, commands=None, stop_on_error=True):
+        """Run several commands in order and return each response.
+
+        Each entry is a regular command dict ({"type": ..., "params": ...})
+        dispatched through _process_command. The whole batch travels in one
+        framed message each way, and if any entry needs the main thread the
+        whole batch runs in a single main-thread task rather than waiting
+        for a scheduler tick per command.
+
+        Args:
+            commands: List of command dicts to execute in order
+            stop_on_error: Stop at the first failing command (default True)
+
+        Returns:
+            Dictionary with the per-command responses and how many ran
+        """
+        commands = self._require_param("commands", commands)
+
+        def run(on_main_thread):
+            results = []
+            for command in commands:
+                if command.get("type") == "batch":
+                    response = {"status": "error", "message": "Nested batch commands are not supported"}
+                else:
+                    response = self._process_command(command, on_main_thread)
+                results.append(response)
+                if stop_on_error and response.get("status") == "error":
+                    break
+            return results
+
+        main_thread_count = sum(1 for command in commands
+                                if self._requires_main_thread(command))
+        if main_thread_count:
+            # Allow each command the timeout it would get on its own
+            response = self._execute_on_main_thread(
+                lambda: run(True), timeout=10.0 * main_thread_count)
+            if response["status"] == "error":
+                raise Exception(response["message"])
+            results = response["result"]
+        else:
+            results = run(False)
+
+        return {
+            "results": results,
+            "executed": len(results),
+            "total": len(commands)
+        }
+
+    def _requires_main_thread(self, command):
+        """Whether a command dict is for a registered main-thread command."""
+        return commands.requires_main_thread(command.get("type", ""))
+
+    @commands.register("ping")
+    def _ping(self):
+        """Liveness check for the client; does not touch the Live API."""
+        return {"ok": True}
+
     @commands.register("get_session_info")
     def _get_session_info(self):
         """Get information about the current session"""
@@ -491,8 +661,13 @@ class AbletonMCP(ControlSurface):
             raise
     
     @commands.register("add_notes_to_clip", main_thread=True)
-    def _add_notes_to_clip(self, track_index=None, clip_index=None, notes=None):
-        """Add MIDI notes to a clip using Live 11+ API."""
+    def _add_notes_to_clip(self, track_index=None, clip_index=None, notes=None, note_columns=None):
+        """
+        Add MIDI notes to a clip using Live 11+ API.
+
+        Notes arrive either as a list of note dicts (notes) or column-wise
+        as one list per field, keyed by field name (note_columns).
+        """
         if notes is None:
             notes = []
         try:
@@ -508,15 +683,26 @@ class AbletonMCP(ControlSurface):
 
             clip = clip_slot.clip
 
+            if note_columns is not None:
+                # Fill defaults one column at a time, then pair them up
+                count = len(note_columns.get("pitch") or [])
+                rows = zip(*[
+                    [default if value is None else value
+                     for value in (note_columns.get(name) or [None] * count)]
+                    for name, default in NOTE_FIELDS])
+            else:
+                rows = ([default if note.get(name) is None else note[name]
+                         for name, default in NOTE_FIELDS] for note in notes)
+
             # Build MidiNoteSpecification objects for Live 11+ API
             note_specs = []
-            for note in notes:
+            for pitch, start_time, duration, velocity, mute in rows:
                 spec = Live.Clip.MidiNoteSpecification(
-                    pitch=int(note.get("pitch", 60)),
-                    start_time=float(note.get("start_time", 0.0)),
-                    duration=float(note.get("duration", 0.25)),
-                    velocity=float(note.get("velocity", 100)),
-                    mute=bool(note.get("mute", False))
+                    pitch=int(pitch),
+                    start_time=float(start_time),
+                    duration=float(duration),
+                    velocity=float(velocity),
+                    mute=bool(mute)
                 )
                 note_specs.append(spec)
 
@@ -524,7 +710,7 @@ class AbletonMCP(ControlSurface):
             clip.add_new_notes(tuple(note_specs))
 
             return {
-                "note_count": len(notes)
+                "note_count": len(note_specs)
             }
         except Exception as e:
             self.log_message("Error adding notes to clip: " + str(e))
@@ -534,8 +720,12 @@ class AbletonMCP(ControlSurface):
     # MIDI Note Manipulation Commands
 
     @commands.register("get_notes_from_clip")
-    def _get_notes_from_clip(self, track_index=None, clip_index=None):
-        """Get all notes from a clip with their IDs (Live 11+ API)."""
+    def _get_notes_from_clip(self, track_index=None, clip_index=None, note_ids=None):
+        """Get notes from a clip with their IDs (Live 11+ API).
+
+        Returns every note unless note_ids is given, in which case only
+        those notes are read and sent.
+        """
         try:
             track_index = self._require_param("track_index", track_index)
             clip_index = self._require_param("clip_index", clip_index)
@@ -546,9 +736,12 @@ class AbletonMCP(ControlSurface):
 
             clip = clip_slot.clip
 
-            # Use get_notes_extended (Live 11+) to get notes with IDs
-            # Signature: (from_pitch, pitch_span, from_time, time_span)
-            notes_data = clip.get_notes_extended(0, 128, 0.0, clip.length)
+            if note_ids is not None:
+                notes_data = clip.get_notes_by_id(note_ids)
+            else:
+                # Use get_notes_extended (Live 11+) to get notes with IDs
+                # Signature: (from_pitch, pitch_span, from_time, time_span)
+                notes_data = clip.get_notes_extended(0, 128, 0.0, clip.length)
 
             notes = []
             for note in notes_data:
@@ -1483,6 +1676,50 @@ class AbletonMCP(ControlSurface):
             self.log_message(traceback.format_exc())
             raise
     
+    @commands.register("load_drum_kit", main_thread=True)
+    def _load_drum_kit(self, track_index=None, rack_uri=None, kit_path=None):
+        """
+        Load a drum rack and then the first loadable kit under a browser path.
+
+        Args:
+            track_index: Index of the track to load onto
+            rack_uri: URI of the drum rack to load
+            kit_path: Browser path of the folder containing the kit
+
+        Returns:
+            Dictionary with the loaded rack and kit names
+        """
+        try:
+            track_index = self._require_param("track_index", track_index)
+            rack_uri = self._require_param("rack_uri", rack_uri)
+            kit_path = self._require_param("kit_path", kit_path)
+
+            # Resolve the kit first so a bad path loads nothing
+            kit_result = self.get_browser_items_at_path(kit_path)
+            if "error" in kit_result:
+                raise ValueError("Failed to find drum kit: {0}".format(kit_result["error"]))
+
+            loadable_kits = [item for item in kit_result.get("items", [])
+                             if item.get("is_loadable", False)]
+            if not loadable_kits:
+                raise ValueError("No loadable drum kits found at '{0}'".format(kit_path))
+            kit = loadable_kits[0]
+
+            rack = self._load_browser_item(track_index, rack_uri)
+            self._load_browser_item(track_index, kit["uri"])
+
+            return {
+                "loaded": True,
+                "track_name": rack["track_name"],
+                "rack_name": rack["item_name"],
+                "kit_name": kit["name"],
+                "kit_uri": kit["uri"]
+            }
+        except Exception as e:
+            self.log_message("Error loading drum kit: {0}".format(str(e)))
+            self.log_message(traceback.format_exc())
+            raise
+
     def _find_browser_item_by_uri(self, browser_or_item, uri, max_depth=10, current_depth=0):
         """Find a browser item by its URI"""
         try:
@@ -1687,6 +1924,45 @@ class AbletonMCP(ControlSurface):
             self.log_message(traceback.format_exc())
             raise
 
+    @commands.register("batch_set_device_parameters_multi", main_thread=True)
+    def _batch_set_device_parameters_multi(self, updates=None):
+        """
+        Set parameters on several devices in one command and one undo step.
+
+        Args:
+            updates: List of dicts, each with "track_index", "device_index",
+                "parameters" and optional "device_path" (as for
+                batch_set_device_parameters)
+
+        Returns:
+            Dictionary with the total count and a result per update. An
+            update whose device cannot be resolved gets an "error" entry
+            instead of aborting the rest.
+        """
+        updates = self._require_param("updates", updates)
+        results = []
+        total = 0
+        self._song.begin_undo_step()
+        try:
+            for update in updates:
+                try:
+                    result = self._batch_set_device_parameters(
+                        track_index=update.get("track_index"),
+                        device_index=update.get("device_index"),
+                        parameters=update.get("parameters"),
+                        device_path=update.get("device_path"))
+                except Exception as e:
+                    result = {"error": str(e)}
+                total += result.get("updated_parameters_count", 0)
+                results.append(result)
+        finally:
+            self._song.end_undo_step()
+
+        return {
+            "updated_parameters_count": total,
+            "results": results
+        }
+
     # Helper methods
     
     def _get_device_type(self, device):
@@ -2,8 +2,18 @@
 
 __version__ = "0.1.0"
 
-# Expose key classes and functions for easier imports
-from .server import AbletonConnection, get_ableton_connection
+# Expose key classes and functions for easier imports. The server module
+# needs the mcp package, so it is imported on first use; the installer
+# modules below (used by install.py) then load without it.
+_LAZY_SERVER_ATTRS = ("AbletonConnection", "get_ableton_connection")
+
+
+def __getattr__(name):
+    if name in _LAZY_SERVER_ATTRS:
+        from . import server
+        return getattr(server, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Platform detection and path resolution
 from .platform import (
@@ -13,6 +23,7 @@ from .platform import (
     AbletonPaths,
     get_platform,
     get_ableton_paths,
+    is_reparse_point,
 )
 
 # Ableton process detection and control
@@ -39,6 +50,7 @@ from .installer import (
     SymlinkExistsError,
     JunctionCreationError,
     install_remote_script,
+    is_remote_script_linked,
     verify_installation,
     get_installed_script_path,
     uninstall_remote_script,
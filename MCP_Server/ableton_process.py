@@ -7,6 +7,7 @@ launching Ableton with TCP readiness checking.
 
 from __future__ import annotations
 
+import select
 import socket
 import subprocess
 import time
@@ -95,13 +96,20 @@ def _is_ableton_running_macos() -> bool:
     This works across all editions (Suite/Standard/Intro) and requires
     no special permissions (unlike osascript System Events).
     """
+    return bool(_ableton_pids_macos())
+
+
+def _ableton_pids_macos() -> list[int]:
+    """Return the PIDs of processes matching "Ableton Live" on macOS."""
     result = subprocess.run(
         ["pgrep", "-f", "Ableton Live"],
         capture_output=True,
         text=True,
     )
     # pgrep returns 0 if any processes matched, 1 if none matched
-    return result.returncode == 0
+    if result.returncode != 0:
+        return []
+    return [int(pid) for pid in result.stdout.split()]
 
 
 def _is_ableton_running_windows() -> bool:
@@ -187,7 +195,11 @@ def wait_for_ableton_quit(
 ) -> bool:
     """Wait for Ableton Live to quit.
 
-    Polls to check if Ableton is still running until it quits or timeout.
+    On macOS the wait is event-driven: the kernel reports each Ableton
+    process's exit through kqueue, so this returns as soon as Ableton is
+    gone rather than at the next poll. Elsewhere, or if kqueue is not
+    usable, polls to check if Ableton is still running until it quits or
+    timeout.
 
     Args:
         timeout: Maximum time to wait in seconds (default: 30).
@@ -204,6 +216,13 @@ def wait_for_ableton_quit(
         platform = get_platform()
 
     start_time = time.monotonic()
+    if platform == Platform.MACOS and hasattr(select, "kqueue"):
+        try:
+            if not _wait_for_exit_kqueue(_ableton_pids_macos(), timeout):
+                return False
+        except OSError:
+            pass  # fall back to polling for the remaining time
+
     while time.monotonic() - start_time < timeout:
         if not is_ableton_running(platform):
             return True
@@ -212,6 +231,47 @@ def wait_for_ableton_quit(
     return False
 
 
+def _wait_for_exit_kqueue(pids: list[int], timeout: float) -> bool:
+    """Block until all of the given processes exit, using kqueue.
+
+    Args:
+        pids: Process IDs to wait for.
+        timeout: Maximum time to wait in seconds.
+
+    Returns:
+        True if every process exited within the timeout, False otherwise.
+
+    Raises:
+        OSError: If kqueue cannot watch the processes.
+    """
+    deadline = time.monotonic() + timeout
+    kq = select.kqueue()
+    try:
+        remaining = set()
+        for pid in pids:
+            event = select.kevent(
+                pid,
+                filter=select.KQ_FILTER_PROC,
+                flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                fflags=select.KQ_NOTE_EXIT,
+            )
+            try:
+                kq.control([event], 0, 0)
+            except ProcessLookupError:
+                continue  # already exited
+            remaining.add(pid)
+
+        while remaining:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return False
+            for event in kq.control(None, len(remaining), left):
+                remaining.discard(event.ident)
+        return True
+    finally:
+        kq.close()
+
+
 def quit_ableton_and_wait(
     timeout: float = 30.0,
     poll_interval: float = 1.0,
@@ -13,7 +13,7 @@ import sys
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from .platform import AbletonPaths, Platform, get_ableton_paths
+from .platform import AbletonPaths, Platform, get_ableton_paths, is_reparse_point
 
 if TYPE_CHECKING:
     pass
@@ -97,17 +97,8 @@ def _is_windows_junction(path: Path) -> bool:
     """
     if sys.platform != "win32":
         return False
-
-    import os
-    import stat
-
-    try:
-        # FILE_ATTRIBUTE_REPARSE_POINT = 0x400
-        # Junctions are reparse points that appear as directories
-        st = os.lstat(path)
-        return bool(st.st_file_attributes & stat.FILE_ATTRIBUTE_REPARSE_POINT)
-    except (OSError, AttributeError):
-        return False
+    # Junctions are reparse points that appear as directories
+    return is_reparse_point(path)
 
 
 def _remove_existing(path: Path) -> None:
@@ -145,19 +136,34 @@ def _create_symlink_macos(source: Path, target: Path) -> None:
 def _create_junction_windows(source: Path, target: Path) -> None:
     """Create a directory junction on Windows.
 
-    Uses mklink /J which creates a directory junction. This is preferred over
-    symlinks on Windows because:
+    A directory junction is preferred over symlinks on Windows because:
     - No elevated privileges required
     - Works across Ableton's Python environment
     - Transparent to applications
 
+    The junction is created in-process with CPython's _winapi.CreateJunction
+    (the same reparse point mklink /J writes), avoiding a cmd.exe spawn.
+    Falls back to mklink /J if that call is unavailable.
+
     Args:
         source: The Remote Script source folder.
         target: The junction path in Remote Scripts directory.
 
     Raises:
-        JunctionCreationError: If mklink fails.
+        JunctionCreationError: If creating the junction fails.
     """
+    try:
+        from _winapi import CreateJunction
+    except ImportError:
+        CreateJunction = None
+
+    if CreateJunction is not None:
+        try:
+            CreateJunction(str(source), str(target))
+        except OSError as e:
+            raise JunctionCreationError(source, target, str(e))
+        return
+
     # mklink /J <link> <target>
     # Note: mklink is a cmd.exe builtin, so we need to use cmd /c
     result = subprocess.run(
@@ -215,6 +221,10 @@ def install_remote_script(
     # Target path for symlink/junction
     target = remote_scripts_dir / script_name
 
+    # Already linked to this source - nothing to do
+    if _links_to(target, source):
+        return target
+
     # Handle existing path
     if target.exists() or target.is_symlink():
         if not force:
@@ -233,6 +243,45 @@ def install_remote_script(
     return target
 
 
+def _links_to(target: Path, source: Path) -> bool:
+    """Check whether target is a symlink/junction resolving to source."""
+    # One lstat rules out a missing path or a real folder before resolving
+    if not is_reparse_point(target) or not target.exists():
+        return False
+    try:
+        return target.resolve() == source.resolve()
+    except OSError:
+        return False
+
+
+def is_remote_script_linked(
+    source_path: Path | None = None,
+    script_name: str = "AbletonMCP",
+    paths: AbletonPaths | None = None,
+) -> bool:
+    """Check whether the Remote Script is already installed from source_path.
+
+    Lets installers skip work (and skip closing Ableton) on re-runs.
+
+    Args:
+        source_path: Path to the Remote Script source folder.
+            If None, defaults to AbletonMCP_Remote_Script in the project root.
+        script_name: Name of the symlink/junction in Remote Scripts folder.
+        paths: AbletonPaths instance for path resolution.
+
+    Returns:
+        True if the installed script links to source_path, False otherwise
+        (including when the source folder doesn't exist).
+    """
+    if paths is None:
+        paths = get_ableton_paths()
+    try:
+        source = _resolve_script_source(source_path)
+    except SourceNotFoundError:
+        return False
+    return _links_to(paths.remote_scripts_dir / script_name, source)
+
+
 def verify_installation(script_name: str = "AbletonMCP", paths: AbletonPaths | None = None) -> bool:
     """Verify that the Remote Script is correctly installed.
 
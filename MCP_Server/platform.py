@@ -6,6 +6,8 @@ platform-specific paths for Ableton Live's Remote Scripts folder and Preferences
 
 from __future__ import annotations
 
+import os
+import stat
 import sys
 from enum import Enum
 from functools import lru_cache
@@ -57,6 +59,31 @@ def get_platform() -> Platform:
     raise UnsupportedPlatformError(platform_str)
 
 
+def is_reparse_point(path: Path) -> bool:
+    """Check if a path is a symlink or, on Windows, any reparse point
+    (including directory junctions).
+
+    Uses a single lstat of the link itself, without following it or
+    opening the target.
+
+    Args:
+        path: Path to check.
+
+    Returns:
+        True if the path is a link, False otherwise (including if it does
+        not exist).
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    # st_file_attributes only exists on Windows
+    attributes = getattr(st, "st_file_attributes", 0)
+    return stat.S_ISLNK(st.st_mode) or bool(
+        attributes & getattr(stat, "FILE_ATTRIBUTE_REPARSE_POINT", 0)
+    )
+
+
 class AbletonPaths:
     """Platform-specific path resolution for Ableton Live.
 
@@ -77,6 +104,8 @@ class AbletonPaths:
             UnsupportedPlatformError: If platform detection fails.
         """
         self.platform = platform if platform is not None else get_platform()
+        # Latest version's Preferences.cfg, once found (see find_preferences_cfg)
+        self._latest_preferences_cfg: Path | None = None
 
     @property
     def user_library_base(self) -> Path:
@@ -171,7 +200,9 @@ class AbletonPaths:
 
         Args:
             version_path: Path to a specific Live version's preference directory.
-                If None, uses the latest installed version.
+                If None, uses the latest installed version. That lookup scans
+                the preferences folder, so its result is remembered for the
+                lifetime of this instance.
 
         Returns:
             Path to the Preferences.cfg file.
@@ -180,7 +211,11 @@ class AbletonPaths:
             AbletonNotFoundError: If the preferences file doesn't exist.
         """
         if version_path is None:
-            version_path = self.find_latest_version()
+            if self._latest_preferences_cfg is not None:
+                return self._latest_preferences_cfg
+            prefs_file = self.find_preferences_cfg(self.find_latest_version())
+            self._latest_preferences_cfg = prefs_file
+            return prefs_file
 
         prefs_file = version_path / "Preferences.cfg"
         if not prefs_file.exists():
@@ -35,9 +35,11 @@ Validated on Ableton Live 11.3.42 and 11.3.43.
 
 from __future__ import annotations
 
+import os
 import shutil
 import struct
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -53,6 +55,9 @@ MIDI_OUT_DEVICE_PREFS_MARKER = b"MidiOutDevicePreferences"
 # Number of control surface slots in Ableton Live
 NUM_CONTROL_SURFACE_SLOTS = 7
 
+# 4-byte little-endian string length prefix, compiled once for every read/write
+STRING_LENGTH_PREFIX = struct.Struct("<I")
+
 # Maximum reasonable string length (sanity check)
 MAX_STRING_LENGTH = 1000
 
@@ -60,6 +65,10 @@ MAX_STRING_LENGTH = 1000
 # Empirically determined from analyzing Preferences.cfg file structure
 MIN_ZERO_PADDING_RUN = 8
 
+# Window size used when skipping zero padding with bytes.lstrip, bounding the
+# slice copied per step while still covering the usual 12-16 byte run at once
+ZERO_SKIP_WINDOW = 64
+
 
 class PreferencesParseError(Exception):
     """Raised when parsing Preferences.cfg fails."""
@@ -137,13 +146,13 @@ def _read_utf16_string(data: bytes, offset: int) -> tuple[str, int]:
     Raises:
         PreferencesParseError: If the string cannot be read at this offset.
     """
-    if offset + 4 > len(data):
+    if offset + STRING_LENGTH_PREFIX.size > len(data):
         raise PreferencesParseError(
             f"Cannot read string length at offset {offset}: "
             f"insufficient data (file size: {len(data)})"
         )
 
-    length = struct.unpack_from("<I", data, offset)[0]
+    (length,) = STRING_LENGTH_PREFIX.unpack_from(data, offset)
 
     if length > MAX_STRING_LENGTH:
         raise PreferencesParseError(
@@ -180,7 +189,51 @@ def _write_utf16_string(value: str) -> bytes:
     """
     encoded = value.encode("utf-16-le")
     length = len(value)  # Character count, not byte count
-    return struct.pack("<I", length) + encoded
+    return STRING_LENGTH_PREFIX.pack(length) + encoded
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write data to a file via a fsynced temporary file and rename.
+
+    The temporary file sits next to the target and takes over its
+    permissions, so a crash or full disk leaves either the old or the new
+    contents in place, never a truncated file. On POSIX the directory is
+    fsynced after the rename so the rename itself survives a crash.
+
+    Args:
+        path: File to write.
+        data: Complete new contents.
+
+    Raises:
+        OSError: If writing or renaming fails.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    _fsync_directory(path.parent)
+
+
+def _fsync_directory(path: Path) -> None:
+    """Flush a directory entry change (e.g. a rename) to disk.
+
+    A no-op on Windows, where directories cannot be opened this way.
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
 def _find_last_marker(data: bytes, marker: bytes) -> int:
@@ -252,8 +305,13 @@ def _find_control_surface_start(data: bytes) -> int:
         )
 
     # Step 3: Skip all zero padding bytes
-    while offset < len(data) and data[offset] == 0:
-        offset += 1
+    # lstrip runs in C; the window bounds each copy and repeats for long runs
+    while offset < len(data):
+        window_end = min(len(data), offset + ZERO_SKIP_WINDOW)
+        stripped = data[offset:window_end].lstrip(b"\x00")
+        offset = window_end - len(stripped)
+        if stripped:
+            break
 
     # Step 4: Validate we're at a valid position
     # The first control surface slot should start with a valid string length
@@ -262,7 +320,7 @@ def _find_control_surface_start(data: bytes) -> int:
             f"Unexpected end of file at offset {offset}"
         )
 
-    first_length = struct.unpack_from("<I", data, offset)[0]
+    (first_length,) = STRING_LENGTH_PREFIX.unpack_from(data, offset)
     if first_length > MAX_STRING_LENGTH:
         raise ControlSurfaceSlotsNotFoundError(
             f"Invalid string length {first_length} at offset {offset}: "
@@ -340,6 +398,30 @@ def _parse_control_surface_slots(
     return slots, offsets
 
 
+@lru_cache(maxsize=8)
+def _load_preferences(
+    path_str: str, mtime_ns: int, size: int
+) -> tuple[bytes, int, tuple[ControlSurfaceSlot, ...], tuple[SlotOffset, ...]]:
+    """Read and parse a Preferences.cfg file, memoized on its stat signature.
+
+    The mtime and size arguments are not used directly; they are part of the
+    cache key so that any change to the file on disk invalidates the entry.
+
+    Args:
+        path_str: Path to the Preferences.cfg file.
+        mtime_ns: File modification time in nanoseconds.
+        size: File size in bytes.
+
+    Returns:
+        Tuple of (raw data, slot start offset, slots, slot offsets).
+    """
+    data = Path(path_str).read_bytes()
+    PreferencesParser._validate_magic_header(data)
+    start_offset = _find_control_surface_start(data)
+    slots, offsets = _parse_control_surface_slots(data, start_offset)
+    return data, start_offset, tuple(slots), tuple(offsets)
+
+
 class PreferencesParser:
     """Parser for Ableton Live Preferences.cfg binary files.
 
@@ -373,6 +455,9 @@ class PreferencesParser:
     def from_file(cls, path: Path | str) -> PreferencesParser:
         """Create a parser from a Preferences.cfg file path.
 
+        Parsed results are cached per (path, mtime, size), so repeated reads
+        of an unchanged file skip both the read and the parse.
+
         Args:
             path: Path to the Preferences.cfg file.
 
@@ -385,11 +470,20 @@ class PreferencesParser:
             ControlSurfaceSlotsNotFoundError: If control surface slots not found.
         """
         path = Path(path)
-        if not path.exists():
-            raise FileNotFoundError(f"Preferences file not found: {path}")
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Preferences file not found: {path}") from None
 
-        data = path.read_bytes()
-        return cls(data)
+        data, start_offset, slots, offsets = _load_preferences(
+            str(path), st.st_mtime_ns, st.st_size
+        )
+        parser = cls.__new__(cls)
+        parser._data = data
+        parser._start_offset = start_offset
+        parser._slots = list(slots)
+        parser._slot_offsets = list(offsets)
+        return parser
 
     @staticmethod
     def _validate_magic_header(data: bytes) -> None:
@@ -533,10 +627,9 @@ class PreferencesWriter:
             InvalidPreferencesFileError: If the file is not a valid Preferences.cfg.
         """
         self._path = Path(prefs_path)
-        if not self._path.exists():
-            raise FileNotFoundError(f"Preferences file not found: {self._path}")
 
-        # Validate the file is parseable
+        # Read and validate the file once; from_file raises FileNotFoundError
+        # for a missing file, and the writer splices into the bytes it read
         self._parser = PreferencesParser.from_file(self._path)
 
     @property
@@ -549,9 +642,13 @@ class PreferencesWriter:
         """Get the path where the backup will be created."""
         return self._path.with_suffix(".cfg.backup")
 
-    def _create_backup(self) -> Path:
+    def _create_backup(self, data: bytes) -> Path:
         """Create a backup of the Preferences.cfg file.
 
+        Args:
+            data: Current contents of the file, already read by the caller,
+                so the backup doesn't need a second read pass.
+
         Returns:
             Path to the backup file.
 
@@ -560,7 +657,8 @@ class PreferencesWriter:
         """
         backup = self.backup_path
         try:
-            shutil.copy2(self._path, backup)
+            _atomic_write(backup, data)
+            shutil.copystat(self._path, backup)
         except OSError as e:
             raise PreferencesWriteError(
                 f"Failed to create backup at {backup}: {e}"
@@ -638,8 +736,9 @@ class PreferencesWriter:
             IndexError: If slot_index is out of range.
             PreferencesWriteError: If the write fails or verification fails.
         """
-        # Read current file data
-        data = self._path.read_bytes()
+        # Splice into the bytes the slot offsets were parsed from, rather
+        # than reading the file again
+        data = self._parser.raw_data
 
         # Find the target slot
         target_index = self._find_target_slot(slot_index)
@@ -650,7 +749,7 @@ class PreferencesWriter:
 
         # Create backup before modification
         if create_backup:
-            self._create_backup()
+            self._create_backup(data)
 
         # Splice the new script name into the data
         new_data = self._splice_data(
@@ -660,9 +759,9 @@ class PreferencesWriter:
             new_bytes,
         )
 
-        # Write the modified data
+        # Write the modified data; never leave a half-written file behind
         try:
-            self._path.write_bytes(new_data)
+            _atomic_write(self._path, new_data)
         except OSError as e:
             raise PreferencesWriteError(
                 f"Failed to write modified preferences to {self._path}: {e}"
@@ -683,8 +782,11 @@ class PreferencesWriter:
         Raises:
             PreferencesWriteError: If verification fails.
         """
+        # Parse the bytes on disk directly rather than via from_file: on
+        # filesystems with coarse mtimes a same-size rewrite could otherwise
+        # be answered from the cache and mask a failed write.
         try:
-            parser = PreferencesParser.from_file(self._path)
+            parser = PreferencesParser(self._path.read_bytes())
         except PreferencesParseError as e:
             raise PreferencesWriteError(
                 f"Verification failed: modified file is not valid. "
@@ -10,7 +10,62 @@ message boundaries.
 
 import json
 import socket
-from typing import Any
+import struct
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # optional C-accelerated codec (the "fast" extra); fall back to stdlib json
+    orjson = None
+
+# 4-byte big-endian length prefix, compiled once
+_LEN = struct.Struct('>I')
+
+
+def encode_json(data: Any) -> bytes:
+    """Serialize data to compact UTF-8 JSON bytes.
+
+    Uses orjson when it is installed, stdlib json otherwise.
+
+    Raises:
+        TypeError: If data is not JSON-serializable
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+
+def decode_json(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Parse JSON text or UTF-8 JSON bytes.
+
+    orjson parses buffers and str directly; the stdlib path decodes
+    buffers to str first.
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON (orjson's
+            JSONDecodeError is a subclass)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, str):
+        return json.loads(data)
+    return json.loads(str(data, 'utf-8'))
+
+
+def format_json(data: Any, pretty: bool = False) -> str:
+    """Serialize data as JSON text for tool responses.
+
+    Output is compact by default; indenting roughly doubles the size of
+    large results such as session trees and, without orjson, drops the
+    stdlib encoder off its C fast path. Pass pretty=True for indented
+    output meant for people rather than the model.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(data, option=option).decode('utf-8')
+    if pretty:
+        return json.dumps(data, indent=2)
+    return json.dumps(data, separators=(',', ':'))
 
 
 def recv_exact(sock: socket.socket, n: int) -> bytes:
@@ -35,27 +90,131 @@ def recv_exact(sock: socket.socket, n: int) -> bytes:
     return data
 
 
-def send_message(sock: socket.socket, data: Any) -> None:
+def recv_exact_into(sock: socket.socket, buffer: bytearray, n: int) -> None:
+    """Receive exactly n bytes into the start of a preallocated buffer.
+
+    Reads go straight into the buffer with recv_into, so no intermediate
+    bytes objects are allocated or concatenated.
+
+    Args:
+        sock: Connected socket to read from
+        buffer: Destination buffer, at least n bytes long
+        n: Exact number of bytes to read
+
+    Raises:
+        ConnectionError: If socket closes before n bytes received
+    """
+    with memoryview(buffer) as view:
+        received = 0
+        while received < n:
+            count = sock.recv_into(view[received:n])
+            if not count:
+                raise ConnectionError("Socket closed before receiving expected data")
+            received += count
+
+
+def enable_nodelay(sock: socket.socket) -> None:
+    """Disable Nagle's algorithm on a connected TCP socket.
+
+    Commands and responses are small request/response messages, so waiting
+    to coalesce them with later writes only adds latency (up to the peer's
+    delayed-ACK timeout) to every round-trip.
+
+    Args:
+        sock: Connected TCP socket to configure
+    """
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+def enable_keepalive(
+    sock: socket.socket, idle: int = 30, interval: int = 10, count: int = 3
+) -> None:
+    """Enable TCP keepalive so an idle persistent connection is kept open
+    and a dead peer is detected without waiting for the next command.
+
+    The idle/interval/count tuning is applied where the platform exposes it
+    (Linux, Windows and macOS on recent Pythons); elsewhere only
+    SO_KEEPALIVE with the OS defaults is set.
+
+    Args:
+        sock: TCP socket to configure
+        idle: Seconds of inactivity before the first probe
+        interval: Seconds between unanswered probes
+        count: Unanswered probes before the connection is dropped
+    """
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    # macOS names the idle option TCP_KEEPALIVE
+    idle_opt = getattr(socket, 'TCP_KEEPIDLE', None) or getattr(socket, 'TCP_KEEPALIVE', None)
+    for opt, value in (
+        (idle_opt, idle),
+        (getattr(socket, 'TCP_KEEPINTVL', None), interval),
+        (getattr(socket, 'TCP_KEEPCNT', None), count),
+    ):
+        if opt is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, opt, value)
+
+
+def _grow(buffer: bytearray, n: int) -> None:
+    """Grow buffer in place (doubling) to hold at least n bytes."""
+    if n > len(buffer):
+        buffer.extend(bytes(max(n, 2 * len(buffer)) - len(buffer)))
+
+
+def _send_framed(sock: socket.socket, header: bytes, payload: bytes,
+                 buffer: Optional[bytearray] = None) -> None:
+    """Send header + payload, using one scatter-gather syscall when possible.
+
+    On platforms without sendmsg (Windows) the frame is assembled into the
+    reusable buffer if one is given, else into a new concatenated bytes
+    object, and sent with a single sendall.
+    """
+    if not hasattr(sock, 'sendmsg'):
+        if buffer is None:
+            sock.sendall(header + payload)
+            return
+        size = len(header) + len(payload)
+        _grow(buffer, size)
+        buffer[:len(header)] = header
+        buffer[len(header):size] = payload
+        with memoryview(buffer) as view:
+            sock.sendall(view[:size])
+        return
+
+    sent = sock.sendmsg([header, payload])
+    # sendmsg may return after a partial write; finish with sendall
+    if sent < len(header):
+        sock.sendall(header[sent:])
+        sock.sendall(payload)
+    elif sent < len(header) + len(payload):
+        sock.sendall(memoryview(payload)[sent - len(header):])
+
+
+def send_message(sock: socket.socket, data: Any,
+                 buffer: Optional[bytearray] = None) -> None:
     """Send a length-prefixed JSON message over socket.
 
     Args:
         sock: Connected socket to send on
         data: JSON-serializable data to send
+        buffer: Optional reusable send buffer for assembling the frame where
+            scatter-gather sends are unavailable (grown if needed)
 
     Raises:
         ConnectionError: If send fails
         TypeError: If data is not JSON-serializable
     """
-    msg = json.dumps(data).encode('utf-8')
-    length_prefix = len(msg).to_bytes(4, 'big')
-    sock.sendall(length_prefix + msg)
+    msg = encode_json(data)
+    _send_framed(sock, _LEN.pack(len(msg)), msg, buffer)
 
 
-def recv_message(sock: socket.socket) -> Any:
+def recv_message(sock: socket.socket, buffer: Optional[bytearray] = None) -> Any:
     """Receive a length-prefixed JSON message from socket.
 
     Args:
         sock: Connected socket to receive from
+        buffer: Optional reusable receive buffer. When given, the frame is
+            read into it in place (growing it if the payload is larger) and
+            decoded from there, avoiding per-message buffer allocations.
 
     Returns:
         Parsed JSON data
@@ -64,7 +223,16 @@ def recv_message(sock: socket.socket) -> Any:
         ConnectionError: If socket closes unexpectedly
         json.JSONDecodeError: If payload is not valid JSON
     """
-    length_bytes = recv_exact(sock, 4)
-    length = int.from_bytes(length_bytes, 'big')
-    payload = recv_exact(sock, length)
-    return json.loads(payload.decode('utf-8'))
+    if buffer is None:
+        length = _LEN.unpack(recv_exact(sock, _LEN.size))[0]
+        payload = recv_exact(sock, length)
+        return decode_json(payload)
+
+    recv_exact_into(sock, buffer, _LEN.size)
+    length = _LEN.unpack_from(buffer)[0]
+    # Grow in place so the caller's reference stays valid
+    _grow(buffer, length)
+    recv_exact_into(sock, buffer, length)
+    with memoryview(buffer) as view:
+        # Parsed straight from the buffer without a bytes copy
+        return decode_json(view[:length])
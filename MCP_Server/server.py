@@ -1,14 +1,20 @@
 # ableton_mcp_server.py
 from mcp.server.fastmcp import FastMCP, Context
+import asyncio
+import os
 import socket
+import select
+import threading
 import json
 import logging
-from dataclasses import dataclass
+import random
+import time
+from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
-from functools import wraps
-from typing import AsyncIterator, Dict, Any, List, Union, Callable, Optional
+from functools import lru_cache, wraps
+from typing import AsyncIterator, Dict, Any, List, Tuple, Union, Callable, Optional
 
-from .protocol import send_message, recv_message
+from .protocol import send_message, recv_message, enable_nodelay, enable_keepalive, format_json
 from .ableton_process import ensure_ableton_running, AbletonTCPNotReadyError, AbletonLaunchError
 
 
@@ -28,12 +34,57 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("AbletonMCPServer")
 
+# Kernel socket buffer size; large enough that a get_session_tree or
+# get_browser_tree response does not need many partial recv() calls
+SOCKET_BUFFER_SIZE = 1024 * 1024
+
+# Initial size of the reusable response buffer (grows for larger responses)
+RECV_BUFFER_SIZE = 64 * 1024
+
+# Initial size of the reusable command buffer (grows for larger commands)
+SEND_BUFFER_SIZE = 4 * 1024
+
+# Set to "0" to skip opening the Ableton connection at server startup
+PRELOAD_ENV_VAR = "EASY_ABLETON_MCP_PRELOAD"
+
+# Set to "1" to launch Ableton at server startup instead of on the first
+# tool call, overlapping the launch with the MCP client handshake
+EAGER_LAUNCH_ENV_VAR = "EASY_ABLETON_MCP_EAGER_LAUNCH"
+
+# Seconds a cached get_session_tree response is reused. Tool calls that
+# modify the session clear the cache immediately; the age limit covers
+# edits made directly in Ableton.
+SESSION_TREE_CACHE_TTL = 5.0
+
+# Seconds cached get_session_info / get_track_info responses are reused.
+# Kept short since these report state (levels, playing clips) that also
+# changes outside tool calls; it only absorbs bursts of repeated reads.
+READ_CACHE_TTL = 0.5
+
+# Seconds cached browser listings are reused. The browser changes less
+# often than the session, but saving to the User Library, adding Places
+# folders or installing packs all change it while Live is running.
+BROWSER_CACHE_TTL = 30.0
+
+# Seconds between background pings of an idle Ableton connection, and how
+# long each ping may wait for its reply
+HEARTBEAT_INTERVAL = 10.0
+HEARTBEAT_TIMEOUT = 5.0
+
 @dataclass
 class AbletonConnection:
     host: str
     port: int
     sock: socket.socket = None
-    
+    _recv_buffer: bytearray = field(
+        default_factory=lambda: bytearray(RECV_BUFFER_SIZE), repr=False
+    )
+    _send_buffer: bytearray = field(
+        default_factory=lambda: bytearray(SEND_BUFFER_SIZE), repr=False
+    )
+    # Id of the last command sent; the Remote Script echoes it back
+    _last_req_id: int = field(default=0, repr=False)
+
     def connect(self) -> bool:
         """Connect to the Ableton Remote Script socket server.
 
@@ -48,28 +99,51 @@ class AbletonConnection:
 
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.settimeout(5.0)  # 5 second connect timeout
+            # Buffer sizes must be set before connect to affect the TCP window
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+            # Local listener: anything slower than this is not coming up
+            self.sock.settimeout(2.0)
             self.sock.connect((self.host, self.port))
             self.sock.settimeout(None)  # Clear timeout for normal operations
-            logger.info(f"Connected to Ableton at {self.host}:{self.port}")
+            enable_nodelay(self.sock)
+            enable_keepalive(self.sock)
+            logger.info("Connected to Ableton at %s:%s", self.host, self.port)
             return True
         except ConnectionRefusedError:
             # Ableton not accepting connections yet - recoverable, retry makes sense
-            logger.warning(f"Connection refused at {self.host}:{self.port} - Ableton may still be starting")
+            logger.warning("Connection refused at %s:%s - Ableton may still be starting", self.host, self.port)
             self._cleanup_socket()
             return False
         except socket.timeout:
             # Slow to respond - recoverable
-            logger.warning(f"Connection timed out at {self.host}:{self.port} - Ableton may be busy")
+            logger.warning("Connection timed out at %s:%s - Ableton may be busy", self.host, self.port)
             self._cleanup_socket()
             return False
         except OSError as e:
             # Permission denied, address in use, network unreachable, etc.
             # These won't fix themselves - fail fast, don't waste retry attempts
-            logger.error(f"Socket error connecting to {self.host}:{self.port}: {e}")
+            logger.error("Socket error connecting to %s:%s: %s", self.host, self.port, e)
             self._cleanup_socket()
             raise
 
+    def is_alive(self) -> bool:
+        """Check, without blocking, that the peer has not closed the socket.
+
+        Between commands nothing should be pending on the socket, so if it
+        polls readable the peer has sent FIN (recv returns b"") or RST
+        (recv raises) and the connection is dead.
+        """
+        if not self.sock:
+            return False
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+            if not readable:
+                return True
+            return bool(self.sock.recv(1, socket.MSG_PEEK))
+        except (OSError, ValueError):
+            return False
+
     def _cleanup_socket(self):
         """Clean up socket on connection failure."""
         if self.sock:
@@ -85,59 +159,143 @@ class AbletonConnection:
             try:
                 self.sock.close()
             except Exception as e:
-                logger.error(f"Error disconnecting from Ableton: {str(e)}")
+                logger.error("Error disconnecting from Ableton: %s", e)
             finally:
                 self.sock = None
 
-    def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+    def send_command(self, command_type: str, params: Dict[str, Any] = None,
+                     stream: Optional[str] = None) -> Dict[str, Any]:
         """Send a command to Ableton and return the response.
 
         Uses length-prefixed framing for reliable message boundaries.
+
+        Raises:
+            AbletonCommandError: If Ableton reports an error status
+        """
+        ok, payload = self.try_command(command_type, params, stream)
+        if not ok:
+            raise AbletonCommandError(payload)
+        return payload
+
+    def try_command(self, command_type: str, params: Dict[str, Any] = None,
+                    stream: Optional[str] = None) -> Tuple[bool, Any]:
+        """Send a command to Ableton without raising on an error status.
+
+        For callers that turn command errors straight into a message, this
+        avoids raising and catching an exception per failed command.
+        Connection and protocol failures still raise.
+
+        Args:
+            command_type: The Ableton command name to send
+            params: Command parameters
+            stream: Optional result key holding a large list. The Remote
+                Script then sends the list one item per frame, so each item
+                is parsed while the rest are still arriving; the result is
+                reassembled before returning.
+
+        Returns:
+            (True, result) on success, (False, error message) if Ableton
+            reports an error status
         """
         if not self.sock and not self.connect():
             raise ConnectionError("Not connected to Ableton")
 
+        self._last_req_id += 1
+        req_id = self._last_req_id
         command = {
             "type": command_type,
-            "params": params or {}
+            "params": params or {},
+            "req_id": req_id
         }
+        if stream:
+            command["stream"] = stream
 
         try:
-            logger.info(f"Sending command: {command_type} with params: {params}")
+            # Per-command logs are DEBUG with lazy arguments so large params
+            # (e.g. note or parameter lists) are only formatted when shown
+            logger.debug("Sending command: %s with params: %s", command_type, params)
 
             # Send the command with length prefix
-            send_message(self.sock, command)
-            logger.info("Command sent, waiting for response...")
+            send_message(self.sock, command, self._send_buffer)
 
             # Receive the response with length prefix
-            response = recv_message(self.sock)
-            logger.info(f"Response received, status: {response.get('status', 'unknown')}")
-
-            if response.get("status") == "error":
-                logger.error(f"Ableton error: {response.get('message')}")
-                raise AbletonCommandError(response.get("message", "Unknown error from Ableton"))
-
-            return response.get("result", {})
+            response = recv_message(self.sock, self._recv_buffer)
+            # A mismatched id means a frame from an earlier, abandoned
+            # command is still queued, so later responses would be off by
+            # one. Older Remote Scripts send no id and are trusted.
+            if response.get("req_id", req_id) != req_id:
+                logger.error("Response id %s does not match request id %s",
+                             response.get("req_id"), req_id)
+                self.disconnect()
+                raise AbletonResponseError(
+                    "Response from Ableton was out of sync; reconnecting")
+            status = response.get("status")
+            logger.debug("Response received, status: %s", status)
+
+            if status == "error":
+                message = response.get("message", "Unknown error from Ableton")
+                logger.error("Ableton error: %s", message)
+                return False, message
+
+            result = response.get("result", {})
+            streamed = response.get("streamed")
+            if streamed:
+                result[streamed["key"]] = [
+                    recv_message(self.sock, self._recv_buffer)
+                    for _ in range(streamed["count"])
+                ]
+            return True, result
         except ConnectionError as e:
-            logger.error(f"Socket connection error: {str(e)}")
+            logger.error("Socket connection error: %s", e)
             self.sock = None
             raise  # Re-raise ConnectionError as-is, it's already descriptive
         except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response from Ableton: {str(e)}")
+            logger.error("Invalid JSON response from Ableton: %s", e)
             self.sock = None
             raise AbletonResponseError(f"Invalid response from Ableton: {str(e)}")
 
+    def ping(self, timeout: Optional[float] = None) -> None:
+        """Check that the Remote Script answers on this connection.
+
+        Uses the ping command, which does not touch the Live API. Any
+        response counts, so an older Remote Script that reports ping as an
+        unknown command still passes.
+
+        Args:
+            timeout: Seconds to wait for the reply (default: no limit)
+
+        Raises:
+            ConnectionError, AbletonResponseError: If no valid response arrives
+            socket.timeout: If the reply takes longer than timeout
+        """
+        if self.sock is not None:
+            self.sock.settimeout(timeout)
+        try:
+            self.try_command("ping")
+        finally:
+            if self.sock is not None:
+                self.sock.settimeout(None)
+
+
 @asynccontextmanager
 async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
     """Manage server startup and shutdown lifecycle.
 
-    Note: We do NOT connect to Ableton on startup (lazy launch).
-    Ableton will be launched and connected on the first tool call.
+    Note: We do NOT launch Ableton on startup (lazy launch). It is launched
+    and connected on the first tool call unless _preconnect already found
+    it running. While the server runs, a heartbeat task pings the idle
+    connection so a dead one is replaced before a tool call trips on it.
     """
+    heartbeat = asyncio.create_task(_heartbeat())
     try:
         logger.info("AbletonMCP server starting up (Ableton will be launched on first tool call)")
         yield {}
     finally:
+        heartbeat.cancel()
+        try:
+            await heartbeat
+        except asyncio.CancelledError:
+            pass
         global _ableton_connection
         if _ableton_connection:
             logger.info("Disconnecting from Ableton on shutdown")
@@ -155,6 +313,64 @@ mcp = FastMCP(
 # Global connection for resources
 _ableton_connection = None
 
+# Serializes use of the single Ableton socket across worker threads
+_ableton_lock = threading.Lock()
+
+
+# Cached read-only responses: "command:params" -> (fetched_at, result)
+_response_cache: Dict[str, tuple] = {}
+
+
+def _invalidate_cache() -> None:
+    """Drop cached responses after a command that may change the session."""
+    _response_cache.clear()
+
+
+def _send_cached(command: str, params: Optional[Dict[str, Any]] = None,
+                 max_age: Optional[float] = None,
+                 stream: Optional[str] = None) -> Dict[str, Any]:
+    """Send a read-only command, reusing a cached result when fresh.
+
+    Args:
+        command: The Ableton command name to send
+        params: Command parameters (part of the cache key)
+        max_age: Seconds a cached result stays valid; None keeps it until
+            the cache is invalidated
+        stream: Optional result list to receive item by item (see
+            AbletonConnection.try_command)
+
+    Returns:
+        The (possibly cached) command result. Callers must not mutate it.
+    """
+    key = f"{command}:{json.dumps(params, sort_keys=True)}"
+    now = time.monotonic()
+    entry = _response_cache.get(key)
+    if entry is not None and (max_age is None or now - entry[0] < max_age):
+        return entry[1]
+    result = get_ableton_connection().send_command(command, params, stream)
+    _response_cache[key] = (now, result)
+    return result
+
+
+def _call_locked(fn: Callable, args: tuple, kwargs: dict) -> Any:
+    """Call fn while holding the connection lock (runs in a worker thread)."""
+    with _ableton_lock:
+        return fn(*args, **kwargs)
+
+
+def _threaded_tool(fn: Callable) -> Callable:
+    """Decorator that turns a blocking tool function into an async one.
+
+    Connecting, launching Ableton, retry sleeps and socket round-trips all
+    block, so they run in a worker thread instead of on the event loop; the
+    lock keeps one command at a time on the shared connection.
+    """
+    @wraps(fn)
+    async def wrapper(*args, **kwargs) -> str:
+        return await asyncio.to_thread(_call_locked, fn, args, kwargs)
+    return wrapper
+
+
 def get_ableton_connection():
     """Get or create a persistent Ableton connection.
 
@@ -164,7 +380,12 @@ def get_ableton_connection():
     global _ableton_connection
 
     if _ableton_connection is not None and _ableton_connection.sock is not None:
-        return _ableton_connection
+        if _ableton_connection.is_alive():
+            return _ableton_connection
+        # Peer closed the socket while idle (e.g. Ableton restarted) -
+        # reconnect now instead of losing the next command to it
+        logger.warning("Ableton closed the connection, reconnecting")
+        _ableton_connection.disconnect()
 
     # Connection doesn't exist or socket is dead, create a new one
     _ableton_connection = None
@@ -184,70 +405,175 @@ def get_ableton_connection():
     except AbletonLaunchError as e:
         raise RuntimeError(f"Failed to launch Ableton Live: {e}")
 
-    # Try to connect up to 3 times with a short delay between attempts
-    max_attempts = 3
+    # Try to connect several times with a short delay between attempts
+    max_attempts = 6
     for attempt in range(1, max_attempts + 1):
         try:
-            logger.info(f"Connecting to Ableton (attempt {attempt}/{max_attempts})...")
+            logger.info("Connecting to Ableton (attempt %d/%d)...", attempt, max_attempts)
             _ableton_connection = AbletonConnection(host="localhost", port=9877)
             if _ableton_connection.connect():
                 logger.info("Created new persistent connection to Ableton")
+                # Ableton may have restarted; nothing cached still applies
+                _invalidate_cache()
 
-                # Validate connection with a simple command
+                # Validate connection with a round-trip
                 try:
-                    _ableton_connection.send_command("get_session_info")
+                    _ableton_connection.ping()
                     logger.info("Connection validated successfully")
                     return _ableton_connection
                 except Exception as e:
-                    logger.error(f"Connection validation failed: {str(e)}")
+                    logger.error("Connection validation failed: %s", e)
                     _ableton_connection.disconnect()
                     _ableton_connection = None
             else:
                 _ableton_connection = None
         except Exception as e:
-            logger.error(f"Connection attempt {attempt} failed: {str(e)}")
+            logger.error("Connection attempt %d failed: %s", attempt, e)
             if _ableton_connection:
                 _ableton_connection.disconnect()
                 _ableton_connection = None
 
-        # Wait before trying again, but only if we have more attempts left
+        # Wait before trying again, but only if we have more attempts left.
+        # Back off exponentially (50ms, 100ms, ... capped at 1s) so a
+        # listener that comes up moments later is picked up quickly; the
+        # jitter keeps retries from landing in lockstep with Ableton's
+        # own startup work.
         if attempt < max_attempts:
-            import time
-            time.sleep(1.0)
+            time.sleep(min(1.0, 0.05 * (2 ** (attempt - 1))) + random.uniform(0, 0.02))
 
     # If we get here, all connection attempts failed
     raise RuntimeError("Could not connect to Ableton. Make sure the Remote Script is running.")
 
 
+def _preconnect() -> None:
+    """Open the Ableton connection before the first tool call.
+
+    Only connects if the Remote Script is already accepting connections;
+    launching Ableton stays lazy. On success the first tool call skips the
+    process check, connect and validation round-trip; otherwise it connects
+    as usual.
+    """
+    global _ableton_connection
+    with _ableton_lock:
+        if _ableton_connection is not None:
+            return
+        connection = AbletonConnection(host="localhost", port=9877)
+        try:
+            if connection.connect():
+                # Bounded, since the lock is held: a Remote Script that
+                # accepts but never answers must not stall tool calls
+                connection.ping(timeout=HEARTBEAT_TIMEOUT)
+                _ableton_connection = connection
+                # Ableton may have restarted; nothing cached still applies
+                _invalidate_cache()
+                logger.info("Connected to Ableton at startup")
+        except Exception as e:
+            logger.info("Ableton not reachable at startup, will connect on first tool call: %s", e)
+            connection.disconnect()
+
+
+def _eager_launch() -> None:
+    """Launch Ableton if needed and connect, ahead of the first tool call.
+
+    Holds the connection lock throughout, so a tool call arriving mid-launch
+    waits for this launch to finish rather than starting its own.
+    """
+    with _ableton_lock:
+        try:
+            get_ableton_connection()
+            logger.info("Connected to Ableton at startup")
+        except Exception as e:
+            logger.warning("Eager launch failed, will retry on first tool call: %s", e)
+
+
+def _heartbeat_once() -> None:
+    """Ping the idle Ableton connection, replacing it if Ableton stopped
+    answering.
+
+    Skipped while a tool call is using the connection (that call checks it
+    anyway) and when there is no connection to keep alive.
+    """
+    global _ableton_connection
+    if not _ableton_lock.acquire(blocking=False):
+        return
+    try:
+        connection = _ableton_connection
+        if connection is None or connection.sock is None:
+            return
+        try:
+            connection.ping(timeout=HEARTBEAT_TIMEOUT)
+            return
+        except Exception as e:
+            logger.warning("Ableton heartbeat failed, reconnecting: %s", e)
+            connection.disconnect()
+            _ableton_connection = None
+    finally:
+        _ableton_lock.release()
+    # Reconnect now if the Remote Script is back, so the next tool call
+    # does not pay for it
+    _preconnect()
+
+
+async def _heartbeat() -> None:
+    """Keep the Ableton connection checked in the background."""
+    while True:
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        await asyncio.to_thread(_heartbeat_once)
+
+
 def ableton_command(
     command: str,
     format_result: Optional[Callable[[dict], str]] = None,
-    error_context: Optional[str] = None
+    error_context: Optional[str] = None,
+    invalidates_cache: bool = True,
+    cached: bool = False,
+    max_age: Optional[float] = None,
+    stream: Optional[str] = None
 ):
     """Decorator that wraps an MCP tool with Ableton connection and error handling.
 
     The decorated function should return a params dict (or None for no params).
     The decorator handles: connection, send_command, error logging, and response formatting.
+    The resulting tool is async; the blocking round-trip runs in a worker thread.
 
     Args:
         command: The Ableton command name to send
         format_result: Optional function to format the result. If None, returns JSON.
         error_context: Optional context string for error messages. Defaults to command name.
+        invalidates_cache: Whether the command may change the session and so clears
+            cached responses. Pass False for read-only commands.
+        cached: Serve the result from the response cache (see _send_cached).
+        max_age: Seconds a cached result stays valid when cached is True.
+        stream: Result list to receive item by item (see AbletonConnection.try_command).
     """
+    # Everything that depends only on the decorator arguments is resolved
+    # once here rather than on every tool call
+    error_prefix = f"Error {error_context or command.replace('_', ' ')}: "
+    formatter = format_result or (lambda result, params: format_json(result))
+
     def decorator(fn: Callable) -> Callable:
+        @_threaded_tool
         @wraps(fn)
         def wrapper(*args, **kwargs) -> str:
-            ctx_name = error_context or command.replace("_", " ")
             try:
-                ableton = get_ableton_connection()
                 params = fn(*args, **kwargs)
-                result = ableton.send_command(command, params)
-                if format_result:
-                    return format_result(result, params)
-                return json.dumps(result, indent=2)
+                if cached:
+                    result = _send_cached(command, params, max_age, stream)
+                else:
+                    ableton = get_ableton_connection()
+                    try:
+                        ok, result = ableton.try_command(command, params, stream)
+                    finally:
+                        # Even a failed command may have partly applied
+                        if invalidates_cache:
+                            _invalidate_cache()
+                    if not ok:
+                        logger.error("%s%s", error_prefix, result)
+                        return error_prefix + str(result)
+                return formatter(result, params)
             except Exception as e:
-                logger.error(f"Error {ctx_name}: {str(e)}")
-                return f"Error {ctx_name}: {str(e)}"
+                logger.error("%s%s", error_prefix, e)
+                return error_prefix + str(e)
         return wrapper
     return decorator
 
@@ -258,24 +584,35 @@ def _format_message(msg: str) -> Callable[[dict, dict], str]:
     return lambda result, params: msg
 
 
+@lru_cache(maxsize=None)
 def _format_template(template: str) -> Callable[[dict, dict], str]:
-    """Create a formatter using a template with result and params access."""
+    """Create a formatter using a template with result and params access.
+
+    Fields resolve against params first, then result; use {result[key]} to
+    prefer the value Ableton reported. Formatters are cached per template.
+    """
+    render = template.format_map
+
     def formatter(result: dict, params: dict) -> str:
-        return template.format(result=result, params=params, **result, **(params or {}))
+        result = result or {}
+        params = params or {}
+        return render({**result, **params, "result": result, "params": params})
     return formatter
 
 
 # Core Tool endpoints
 
 @mcp.tool()
-@ableton_command("get_session_info")
+@ableton_command("get_session_info", invalidates_cache=False,
+                 cached=True, max_age=READ_CACHE_TTL)
 def get_session_info(ctx: Context) -> str:
     """Get detailed information about the current Ableton session"""
     return None
 
 
 @mcp.tool()
-@ableton_command("get_session_tree")
+@ableton_command("get_session_tree", invalidates_cache=False,
+                 cached=True, max_age=SESSION_TREE_CACHE_TTL, stream="tracks")
 def get_session_tree(ctx: Context) -> str:
     """Get a compact tree view of the entire Ableton session.
 
@@ -287,7 +624,8 @@ def get_session_tree(ctx: Context) -> str:
 
 
 @mcp.tool()
-@ableton_command("get_track_info")
+@ableton_command("get_track_info", invalidates_cache=False,
+                 cached=True, max_age=READ_CACHE_TTL)
 def get_track_info(ctx: Context, track_index: int) -> str:
     """
     Get detailed information about a specific track in Ableton.
@@ -378,7 +716,7 @@ def set_track_solo(ctx: Context, track_index: int, solo: bool) -> str:
 
 @mcp.tool()
 @ableton_command("create_clip",
-                 format_result=lambda r, p: f"Created new clip at track {p['track_index']}, slot {p['clip_index']} with length {p['length']} beats")
+                 format_result=_format_template("Created new clip at track {track_index}, slot {clip_index} with length {length} beats"))
 def create_clip(ctx: Context, track_index: int, clip_index: int, length: float = 4.0) -> str:
     """
     Create a new MIDI clip in the specified track and clip slot.
@@ -391,6 +729,20 @@ def create_clip(ctx: Context, track_index: int, clip_index: int, length: float =
     return {"track_index": track_index, "clip_index": clip_index, "length": length}
 
 
+# MIDI note fields, in the order the Remote Script reads note columns
+NOTE_FIELDS = ("pitch", "start_time", "duration", "velocity", "mute")
+
+
+def _notes_to_columns(notes: List[Dict[str, Any]]) -> Dict[str, list]:
+    """Convert a list of note dicts into one list per note field.
+
+    Field names are sent once instead of once per note, roughly halving
+    the payload for large note lists. Missing fields become None and take
+    the Remote Script's defaults.
+    """
+    return {name: [note.get(name) for note in notes] for name in NOTE_FIELDS}
+
+
 @mcp.tool()
 @ableton_command("add_notes_to_clip")
 def add_notes_to_clip(
@@ -407,23 +759,26 @@ def add_notes_to_clip(
     - clip_index: The index of the clip slot containing the clip
     - notes: List of note dictionaries, each with pitch, start_time, duration, velocity, and mute
     """
-    return {"track_index": track_index, "clip_index": clip_index, "notes": notes}
+    return {"track_index": track_index, "clip_index": clip_index,
+            "note_columns": _notes_to_columns(notes)}
 
 
 @mcp.tool()
-@ableton_command("get_notes_from_clip")
-def get_notes_from_clip(ctx: Context, track_index: int, clip_index: int) -> str:
+@ableton_command("get_notes_from_clip", invalidates_cache=False)
+def get_notes_from_clip(ctx: Context, track_index: int, clip_index: int,
+                        note_ids: List[int] = None) -> str:
     """
-    Get all MIDI notes from a clip with their IDs.
+    Get MIDI notes from a clip with their IDs.
 
     Parameters:
     - track_index: The index of the track containing the clip
     - clip_index: The index of the clip slot containing the clip
+    - note_ids: Optional list of specific note IDs to read. If not provided, all notes are returned.
 
     Returns JSON with notes array, each note having:
     note_id, pitch, start_time, duration, velocity, mute, probability
     """
-    return {"track_index": track_index, "clip_index": clip_index}
+    return {"track_index": track_index, "clip_index": clip_index, "note_ids": note_ids}
 
 
 @mcp.tool()
@@ -497,7 +852,7 @@ def quantize_notes_in_clip(ctx: Context, track_index: int, clip_index: int,
 
 @mcp.tool()
 @ableton_command("set_clip_name",
-                 format_result=lambda r, p: f"Renamed clip at track {p['track_index']}, slot {p['clip_index']} to '{p['name']}'")
+                 format_result=_format_template("Renamed clip at track {track_index}, slot {clip_index} to '{name}'"))
 def set_clip_name(ctx: Context, track_index: int, clip_index: int, name: str) -> str:
     """
     Set the name of a clip.
@@ -512,7 +867,7 @@ def set_clip_name(ctx: Context, track_index: int, clip_index: int, name: str) ->
 
 @mcp.tool()
 @ableton_command("set_tempo",
-                 format_result=lambda r, p: f"Set tempo to {p['tempo']} BPM")
+                 format_result=_format_template("Set tempo to {tempo} BPM"))
 def set_tempo(ctx: Context, tempo: float) -> str:
     """
     Set the tempo of the Ableton session.
@@ -552,7 +907,7 @@ def load_instrument_or_effect(ctx: Context, track_index: int, uri: str) -> str:
 
 @mcp.tool()
 @ableton_command("fire_clip",
-                 format_result=lambda r, p: f"Started playing clip at track {p['track_index']}, slot {p['clip_index']}")
+                 format_result=_format_template("Started playing clip at track {track_index}, slot {clip_index}"))
 def fire_clip(ctx: Context, track_index: int, clip_index: int) -> str:
     """
     Start playing a clip.
@@ -566,7 +921,7 @@ def fire_clip(ctx: Context, track_index: int, clip_index: int) -> str:
 
 @mcp.tool()
 @ableton_command("stop_clip",
-                 format_result=lambda r, p: f"Stopped clip at track {p['track_index']}, slot {p['clip_index']}")
+                 format_result=_format_template("Stopped clip at track {track_index}, slot {clip_index}"))
 def stop_clip(ctx: Context, track_index: int, clip_index: int) -> str:
     """
     Stop playing a clip.
@@ -579,23 +934,46 @@ def stop_clip(ctx: Context, track_index: int, clip_index: int) -> str:
 
 
 @mcp.tool()
-@ableton_command("start_playback", format_result=lambda r, p: "Started playback")
+@ableton_command("start_playback", format_result=_format_message("Started playback"))
 def start_playback(ctx: Context) -> str:
     """Start playing the Ableton session."""
     return None
 
 
 @mcp.tool()
-@ableton_command("stop_playback", format_result=lambda r, p: "Stopped playback")
+@ableton_command("stop_playback", format_result=_format_message("Stopped playback"))
 def stop_playback(ctx: Context) -> str:
     """Stop playing the Ableton session."""
     return None
 
 
+@mcp.tool()
+@ableton_command("batch")
+def batch_commands(ctx: Context, commands: List[Dict[str, Any]],
+                   stop_on_error: bool = True) -> str:
+    """
+    Run several Ableton commands in a single round-trip.
+
+    Use this for multi-step edits (renaming many tracks, setting many
+    parameters) instead of calling the individual tools one at a time.
+
+    Parameters:
+    - commands: List of commands, each {"type": <command name>, "params": {...}}.
+                Command names and params mostly match the tools of the same name, e.g.
+                [{"type": "set_track_name", "params": {"track_index": 0, "name": "Bass"}},
+                 {"type": "set_track_volume", "params": {"track_index": 0, "volume": 0.7}}]
+    - stop_on_error: Stop at the first failing command (default: True)
+
+    Returns JSON with results (one {status, result|message} per executed command),
+    executed, and total.
+    """
+    return {"commands": commands, "stop_on_error": stop_on_error}
+
+
 # Transport & Timing Tools
 
 @mcp.tool()
-@ableton_command("get_current_time")
+@ableton_command("get_current_time", invalidates_cache=False)
 def get_current_time(ctx: Context) -> str:
     """
     Get the current song position in beats.
@@ -606,7 +984,7 @@ def get_current_time(ctx: Context) -> str:
 
 
 @mcp.tool()
-@ableton_command("get_is_playing")
+@ableton_command("get_is_playing", invalidates_cache=False)
 def get_is_playing(ctx: Context) -> str:
     """
     Get the current playback state and metronome status.
@@ -678,7 +1056,58 @@ def create_audio_track(ctx: Context, index: int = -1) -> str:
     return {"index": index}
 
 
+def _format_browser_tree(categories: List[Dict[str, Any]]) -> str:
+    """Render browser categories as an indented bullet list.
+
+    Walks each category depth-first with an explicit stack and joins the
+    pieces once, so large trees format in linear time. Each category is
+    followed by a blank line.
+    """
+    parts = []
+    for category in categories:
+        stack = [(category, 0)]
+        while stack:
+            item, indent = stack.pop()
+            if not item:
+                continue
+            parts.extend(("  " * indent, "• ", item.get("name", "Unknown")))
+            path = item.get("path", "")
+            if path:
+                parts.extend((" (path: ", path, ")"))
+            if item.get("has_more", False):
+                parts.append(" [...]")
+            parts.append("\n")
+            # Push children in reverse so they pop in original order
+            for child in reversed(item.get("children", [])):
+                stack.append((child, indent + 1))
+        parts.append("\n")
+    return "".join(parts)
+
+
+def _browser_error(error_msg: str, context: str) -> str:
+    """Turn a failed browser command into a message with a hint for the model.
+
+    Shared by the browser tools, whose results need custom formatting and
+    so do not go through ableton_command.
+    """
+    if "Browser is not available" in error_msg:
+        logger.error(f"Browser is not available in Ableton: {error_msg}")
+        return "Error: The Ableton browser is not available. Make sure Ableton Live is fully loaded and try again."
+    if "Could not access Live application" in error_msg:
+        logger.error(f"Could not access Live application: {error_msg}")
+        return "Error: Could not access the Ableton Live application. Make sure Ableton Live is running and the Remote Script is loaded."
+    if "Unknown or unavailable category" in error_msg:
+        logger.error(f"Invalid browser category: {error_msg}")
+        return f"Error: {error_msg}. Please check the available categories using get_browser_tree."
+    if "Path part" in error_msg and "not found" in error_msg:
+        logger.error(f"Path not found: {error_msg}")
+        return f"Error: {error_msg}. Please check the path and try again."
+    logger.error(f"Error {context}: {error_msg}")
+    return f"Error {context}: {error_msg}"
+
+
 @mcp.tool()
+@_threaded_tool
 def get_browser_tree(ctx: Context, category_type: str = "all", max_depth: int = 2, folders_only: bool = True) -> str:
     """
     Get a hierarchical tree of browser categories from Ableton.
@@ -689,12 +1118,13 @@ def get_browser_tree(ctx: Context, category_type: str = "all", max_depth: int =
     - folders_only: If True (default), only show folders, not individual files. Use get_browser_items_at_path to drill into specific folders.
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_browser_tree", {
+        # The browser rarely changes, so the tree is reused for a while;
+        # a modifying command or reconnect also clears it
+        result = _send_cached("get_browser_tree", {
             "category_type": category_type,
             "max_depth": max_depth,
             "folders_only": folders_only
-        })
+        }, BROWSER_CACHE_TTL, stream="categories")
         
         # Check if we got any categories
         if "available_categories" in result and len(result.get("categories", [])) == 0:
@@ -704,48 +1134,13 @@ def get_browser_tree(ctx: Context, category_type: str = "all", max_depth: int =
         
         # Format the tree in a more readable way
         total_folders = result.get("total_folders", 0)
-        formatted_output = f"Browser tree for '{category_type}' (showing {total_folders} folders):\n\n"
-        
-        def format_tree(item, indent=0):
-            output = ""
-            if item:
-                prefix = "  " * indent
-                name = item.get("name", "Unknown")
-                path = item.get("path", "")
-                has_more = item.get("has_more", False)
-                
-                # Add this item
-                output += f"{prefix}• {name}"
-                if path:
-                    output += f" (path: {path})"
-                if has_more:
-                    output += " [...]"
-                output += "\n"
-                
-                # Add children
-                for child in item.get("children", []):
-                    output += format_tree(child, indent + 1)
-            return output
-        
-        # Format each category
-        for category in result.get("categories", []):
-            formatted_output += format_tree(category)
-            formatted_output += "\n"
-        
-        return formatted_output
+        header = f"Browser tree for '{category_type}' (showing {total_folders} folders):\n\n"
+        return header + _format_browser_tree(result.get("categories", []))
     except Exception as e:
-        error_msg = str(e)
-        if "Browser is not available" in error_msg:
-            logger.error(f"Browser is not available in Ableton: {error_msg}")
-            return "Error: The Ableton browser is not available. Make sure Ableton Live is fully loaded and try again."
-        elif "Could not access Live application" in error_msg:
-            logger.error(f"Could not access Live application: {error_msg}")
-            return "Error: Could not access the Ableton Live application. Make sure Ableton Live is running and the Remote Script is loaded."
-        else:
-            logger.error(f"Error getting browser tree: {error_msg}")
-            return f"Error getting browser tree: {error_msg}"
+        return _browser_error(str(e), "getting browser tree")
 
 @mcp.tool()
+@_threaded_tool
 def get_browser_items_at_path(ctx: Context, path: str) -> str:
     """
     Get browser items at a specific path in Ableton's browser.
@@ -755,10 +1150,10 @@ def get_browser_items_at_path(ctx: Context, path: str) -> str:
             where category is one of the available browser categories in Ableton
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_browser_items_at_path", {
+        # Cached like get_browser_tree; large folders arrive item by item
+        result = _send_cached("get_browser_items_at_path", {
             "path": path
-        })
+        }, BROWSER_CACHE_TTL, stream="items")
         
         # Check if there was an error with available categories
         if "error" in result and "available_categories" in result:
@@ -767,26 +1162,13 @@ def get_browser_items_at_path(ctx: Context, path: str) -> str:
             return (f"Error: {error}\n"
                    f"Available browser categories: {', '.join(available_cats)}")
         
-        return json.dumps(result, indent=2)
+        return format_json(result)
     except Exception as e:
-        error_msg = str(e)
-        if "Browser is not available" in error_msg:
-            logger.error(f"Browser is not available in Ableton: {error_msg}")
-            return "Error: The Ableton browser is not available. Make sure Ableton Live is fully loaded and try again."
-        elif "Could not access Live application" in error_msg:
-            logger.error(f"Could not access Live application: {error_msg}")
-            return "Error: Could not access the Ableton Live application. Make sure Ableton Live is running and the Remote Script is loaded."
-        elif "Unknown or unavailable category" in error_msg:
-            logger.error(f"Invalid browser category: {error_msg}")
-            return f"Error: {error_msg}. Please check the available categories using get_browser_tree."
-        elif "Path part" in error_msg and "not found" in error_msg:
-            logger.error(f"Path not found: {error_msg}")
-            return f"Error: {error_msg}. Please check the path and try again."
-        else:
-            logger.error(f"Error getting browser items at path: {error_msg}")
-            return f"Error getting browser items at path: {error_msg}"
+        return _browser_error(str(e), "getting browser items at path")
 
 @mcp.tool()
+@ableton_command("load_drum_kit",
+                 format_result=_format_template("Loaded drum rack and kit '{kit_name}' on track {track_index}"))
 def load_drum_kit(ctx: Context, track_index: int, rack_uri: str, kit_path: str) -> str:
     """
     Load a drum rack and then load a specific drum kit into it.
@@ -796,47 +1178,14 @@ def load_drum_kit(ctx: Context, track_index: int, rack_uri: str, kit_path: str)
     - rack_uri: The URI of the drum rack to load (e.g., 'Drums/Drum Rack')
     - kit_path: Path to the drum kit inside the browser (e.g., 'drums/acoustic/kit1')
     """
-    try:
-        ableton = get_ableton_connection()
-        
-        # Step 1: Load the drum rack
-        result = ableton.send_command("load_browser_item", {
-            "track_index": track_index,
-            "item_uri": rack_uri
-        })
-        
-        if not result.get("loaded", False):
-            return f"Failed to load drum rack with URI '{rack_uri}'"
-        
-        # Step 2: Get the drum kit items at the specified path
-        kit_result = ableton.send_command("get_browser_items_at_path", {
-            "path": kit_path
-        })
-        
-        if "error" in kit_result:
-            return f"Loaded drum rack but failed to find drum kit: {kit_result.get('error')}"
-        
-        # Step 3: Find a loadable drum kit
-        kit_items = kit_result.get("items", [])
-        loadable_kits = [item for item in kit_items if item.get("is_loadable", False)]
-        
-        if not loadable_kits:
-            return f"Loaded drum rack but no loadable drum kits found at '{kit_path}'"
-        
-        # Step 4: Load the first loadable kit
-        kit_uri = loadable_kits[0].get("uri")
-        ableton.send_command("load_browser_item", {
-            "track_index": track_index,
-            "item_uri": kit_uri
-        })
-        
-        return f"Loaded drum rack and kit '{loadable_kits[0].get('name')}' on track {track_index}"
-    except Exception as e:
-        logger.error(f"Error loading drum kit: {str(e)}")
-        return f"Error loading drum kit: {str(e)}"
+    return {
+        "track_index": track_index,
+        "rack_uri": rack_uri,
+        "kit_path": kit_path
+    }
 
 @mcp.tool()
-@ableton_command("get_device_parameters")
+@ableton_command("get_device_parameters", invalidates_cache=False)
 def get_device_parameters(ctx: Context, track_index: int, device_index: int,
                           device_path: List[int] = None) -> str:
     """
@@ -901,10 +1250,27 @@ def batch_set_device_parameters(ctx: Context, track_index: int, device_index: in
     }
 
 
+@mcp.tool()
+@ableton_command("batch_set_device_parameters_multi")
+def batch_set_device_parameters_multi(ctx: Context, updates: List[Dict[str, Any]]) -> str:
+    """
+    Set parameters on several devices, across tracks, in a single round-trip.
+
+    All changes are applied as one undo step.
+
+    Parameters:
+    - updates: List of per-device updates, each with "track_index", "device_index",
+               "parameters" (as for batch_set_device_parameters) and optional "device_path"
+               Example: [{"track_index": 0, "device_index": 1, "parameters": [{"index": 1, "value": 0.5}]},
+                         {"track_index": 2, "device_index": 0, "parameters": [{"index": 3, "value": 0.2}]}]
+    """
+    return {"updates": updates}
+
+
 # Automation Envelope Tools
 
 @mcp.tool()
-@ableton_command("get_clip_envelope")
+@ableton_command("get_clip_envelope", invalidates_cache=False)
 def get_clip_envelope(ctx: Context, track_index: int, clip_index: int,
                       device_index: int, parameter_index: int) -> str:
     """
@@ -950,7 +1316,7 @@ def create_automation_envelope(ctx: Context, track_index: int, clip_index: int,
 
 
 @mcp.tool()
-@ableton_command("get_envelope_value_at_time")
+@ableton_command("get_envelope_value_at_time", invalidates_cache=False)
 def get_envelope_value_at_time(ctx: Context, track_index: int, clip_index: int,
                                 device_index: int, parameter_index: int,
                                 time: float) -> str:
@@ -1004,7 +1370,7 @@ def insert_envelope_point(ctx: Context, track_index: int, clip_index: int,
 
 @mcp.tool()
 @ableton_command("clear_clip_envelopes",
-                 format_result=lambda r, p: f"Cleared all automation envelopes from clip at track {p['track_index']}, slot {p['clip_index']}")
+                 format_result=_format_template("Cleared all automation envelopes from clip at track {track_index}, slot {clip_index}"))
 def clear_clip_envelopes(ctx: Context, track_index: int, clip_index: int) -> str:
     """
     Clear all automation envelopes from a clip.
@@ -1025,7 +1391,7 @@ def clear_clip_envelopes(ctx: Context, track_index: int, clip_index: int) -> str
 # Scene Management Tools
 
 @mcp.tool()
-@ableton_command("get_scenes_info")
+@ableton_command("get_scenes_info", invalidates_cache=False)
 def get_scenes_info(ctx: Context) -> str:
     """
     Get information about all scenes in the session.
@@ -1096,7 +1462,7 @@ def fire_scene(ctx: Context, scene_index: int) -> str:
 # Clip Properties Tools
 
 @mcp.tool()
-@ableton_command("get_clip_properties")
+@ableton_command("get_clip_properties", invalidates_cache=False)
 def get_clip_properties(ctx: Context, track_index: int, clip_index: int) -> str:
     """
     Get properties of a clip including loop settings.
@@ -1243,8 +1609,8 @@ def main():
                 else:
                     print("No AbletonMCP entry found in preferences")
 
-            print("\n=== Uninstall Complete ===")
-            print("\nAbleton MCP has been removed. You can safely delete the source code if desired.")
+            print("\n=== Uninstall Complete ===\n"
+                  "\nAbleton MCP has been removed. You can safely delete the source code if desired.")
             return 0
 
         except AbletonNotFoundError as e:
@@ -1257,8 +1623,8 @@ def main():
     elif args.install:
         # Import here to avoid circular imports and keep server startup fast
         from .platform import get_platform, get_ableton_paths, AbletonNotFoundError
-        from .installer import install_remote_script
-        from .preferences import PreferencesWriter, NoEmptySlotError
+        from .installer import install_remote_script, is_remote_script_linked
+        from .preferences import PreferencesParser, PreferencesWriter, NoEmptySlotError
         from .ableton_process import is_ableton_running, ensure_ableton_closed
         from pathlib import Path
 
@@ -1291,6 +1657,17 @@ def main():
             print(f"Platform: {get_platform().name}")
             print(f"Remote Scripts: {paths.remote_scripts_dir}")
 
+            # Re-running on a configured system changes nothing, so skip
+            # closing Ableton and rewriting the symlink and preferences
+            if is_remote_script_linked(script_source, script_name, paths):
+                prefs = PreferencesParser.from_file(paths.find_preferences_cfg())
+                existing = prefs.find_slot_by_script(script_name)
+                if existing:
+                    print(f"\nAlready installed: {paths.remote_scripts_dir / script_name} -> {script_source}\n"
+                          f"Already configured in slot {existing.display_index}\n"
+                          "\n=== Installation Complete ===")
+                    return 0
+
             # Check if Ableton is running
             if is_ableton_running():
                 print("\nAbleton Live is running. It must be closed to modify preferences.")
@@ -1317,27 +1694,35 @@ def main():
                 print(f"  -> Configured in slot {slot + 1}")
                 print(f"  -> Backup saved to {prefs_path}.backup")
 
-            print("\n=== Installation Complete ===")
-            print("\nNext steps:")
-            print("1. Start Ableton Live")
-            print("2. The MCP server will auto-launch Ableton when needed")
-            print("\nTo run the server:")
-            print("  uvx easy-ableton-mcp")
+            print("\n".join([
+                "\n=== Installation Complete ===",
+                "\nNext steps:",
+                "1. Start Ableton Live",
+                "2. The MCP server will auto-launch Ableton when needed",
+                "\nTo run the server:",
+                "  uvx easy-ableton-mcp",
+            ]))
             return 0
 
         except AbletonNotFoundError as e:
-            print(f"\nERROR: {e}")
-            print("Make sure Ableton Live is installed and has been run at least once.")
+            print(f"\nERROR: {e}\n"
+                  "Make sure Ableton Live is installed and has been run at least once.")
             return 1
         except NoEmptySlotError:
-            print("\nERROR: All 7 control surface slots are in use.")
-            print("Please free up a slot in Ableton's preferences.")
+            print("\nERROR: All 7 control surface slots are in use.\n"
+                  "Please free up a slot in Ableton's preferences.")
             return 1
         except Exception as e:
             print(f"\nERROR: {e}")
             return 1
     else:
-        # Normal server mode
+        # Normal server mode. Connect in the background if Ableton is
+        # already running (or launch it, if opted in) so the first tool
+        # call doesn't pay for it.
+        if os.environ.get(EAGER_LAUNCH_ENV_VAR) == "1":
+            threading.Thread(target=_eager_launch, name="ableton-launch", daemon=True).start()
+        elif os.environ.get(PRELOAD_ENV_VAR, "1") != "0":
+            threading.Thread(target=_preconnect, name="ableton-preconnect", daemon=True).start()
         mcp.run()
 
 if __name__ == "__main__":
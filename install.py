@@ -18,11 +18,16 @@ from __future__ import annotations
 
 import argparse
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=1)
 def get_project_root() -> Path:
-    """Get the project root directory (where this script lives)."""
+    """Get the project root directory (where this script lives).
+
+    Resolved once; later calls reuse the result.
+    """
     return Path(__file__).parent.resolve()
 
 
@@ -34,6 +39,11 @@ def setup_import_path() -> None:
         sys.path.insert(0, str(project_root))
 
 
+def print_error(*lines: str) -> None:
+    """Print an error message block to stderr in a single write."""
+    print("\n".join(lines), file=sys.stderr)
+
+
 def main() -> int:
     """Main entry point for the install CLI."""
     parser = argparse.ArgumentParser(
@@ -75,103 +85,85 @@ After installation, launch Ableton Live to use the MCP server.
 
     # Validate source exists
     if not source_path.exists():
-        print(f"Error: Source folder not found: {source_path}", file=sys.stderr)
-        print(
+        print_error(
+            f"Error: Source folder not found: {source_path}",
             "Make sure the Remote Script folder exists at the specified location.",
-            file=sys.stderr,
         )
         return 1
 
     if not source_path.is_dir():
-        print(f"Error: Source path is not a directory: {source_path}", file=sys.stderr)
+        print_error(f"Error: Source path is not a directory: {source_path}")
         return 1
 
     # Check for required __init__.py
     init_file = source_path / "__init__.py"
     if not init_file.exists():
-        print(
-            f"Error: Source folder missing __init__.py: {source_path}", file=sys.stderr
+        print_error(
+            f"Error: Source folder missing __init__.py: {source_path}",
+            "Remote Scripts must contain an __init__.py file.",
         )
-        print("Remote Scripts must contain an __init__.py file.", file=sys.stderr)
         return 1
 
-    # Setup import path and import modules
-    # We import directly from module files to avoid triggering __init__.py
-    # which has dependencies on external packages (mcp) not needed for installation
+    # Setup import path and import modules. The package imports its server
+    # (and the mcp dependency) lazily, so these load without mcp installed.
     setup_import_path()
 
     try:
-        import importlib.util
-
-        def load_module(name: str, file_path: Path):
-            """Load a module directly from file, bypassing __init__.py."""
-            spec = importlib.util.spec_from_file_location(name, file_path)
-            if spec is None or spec.loader is None:
-                raise ImportError(f"Could not load module from {file_path}")
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[name] = module
-            spec.loader.exec_module(module)
-            return module
-
-        mcp_server_dir = get_project_root() / "MCP_Server"
-
-        # Load modules in dependency order
-        platform_mod = load_module(
-            "MCP_Server.platform", mcp_server_dir / "platform.py"
-        )
-        ableton_process_mod = load_module(
-            "MCP_Server.ableton_process", mcp_server_dir / "ableton_process.py"
-        )
-        installer_mod = load_module(
-            "MCP_Server.installer", mcp_server_dir / "installer.py"
-        )
-        preferences_mod = load_module(
-            "MCP_Server.preferences", mcp_server_dir / "preferences.py"
-        )
-
-        # Extract what we need
-        AbletonQuitError = ableton_process_mod.AbletonQuitError
-        ensure_ableton_closed = ableton_process_mod.ensure_ableton_closed
-        InstallationError = installer_mod.InstallationError
-        install_remote_script = installer_mod.install_remote_script
-        AbletonNotFoundError = platform_mod.AbletonNotFoundError
-        UnsupportedPlatformError = platform_mod.UnsupportedPlatformError
-        get_ableton_paths = platform_mod.get_ableton_paths
-        NoEmptySlotError = preferences_mod.NoEmptySlotError
-        PreferencesParseError = preferences_mod.PreferencesParseError
-        PreferencesWriteError = preferences_mod.PreferencesWriteError
-        PreferencesWriter = preferences_mod.PreferencesWriter
-
+        from MCP_Server import ableton_process as ableton_process_mod
+        from MCP_Server import installer as installer_mod
+        from MCP_Server import platform as platform_mod
+        from MCP_Server import preferences as preferences_mod
     except (ImportError, FileNotFoundError) as e:
-        print(f"Error: Failed to import required modules: {e}", file=sys.stderr)
-        print(
-            "Make sure MCP_Server package exists in the project root.", file=sys.stderr
+        print_error(
+            f"Error: Failed to import required modules: {e}",
+            "Make sure MCP_Server package exists in the project root.",
         )
         return 1
 
     # Step 0: Check platform support
     try:
-        paths = get_ableton_paths()
-    except UnsupportedPlatformError as e:
-        print(f"Error: {e}", file=sys.stderr)
+        paths = platform_mod.get_ableton_paths()
+    except platform_mod.UnsupportedPlatformError as e:
+        print_error(f"Error: {e}")
         return 1
 
+    AbletonNotFoundError = platform_mod.AbletonNotFoundError
+    InstallationError = installer_mod.InstallationError
+    install_remote_script = installer_mod.install_remote_script
+    is_remote_script_linked = installer_mod.is_remote_script_linked
+    NoEmptySlotError = preferences_mod.NoEmptySlotError
+    PreferencesParseError = preferences_mod.PreferencesParseError
+    PreferencesWriteError = preferences_mod.PreferencesWriteError
+    PreferencesParser = preferences_mod.PreferencesParser
+    PreferencesWriter = preferences_mod.PreferencesWriter
+
     print(f"Installing '{script_name}' from: {source_path}")
     print(f"Platform: {paths.platform.name}")
 
+    # Re-running on a configured system changes nothing, so skip closing
+    # Ableton and rewriting the symlink and preferences. A missing or
+    # unreadable preferences file just falls through to the full install,
+    # which reports it properly.
+    try:
+        if is_remote_script_linked(source_path, script_name, paths):
+            prefs = PreferencesParser.from_file(paths.find_preferences_cfg())
+            existing_slot = prefs.find_slot_by_script(script_name)
+            if existing_slot is not None:
+                print(f"\n'{script_name}' is already installed and configured "
+                      f"in slot {existing_slot.display_index}. Nothing to do.")
+                return 0
+    except (AbletonNotFoundError, PreferencesParseError, OSError):
+        pass
+
     # Step 1: Ensure Ableton is closed
     print("\nChecking if Ableton Live is running...")
     try:
-        ensure_ableton_closed(timeout=30.0)
-    except AbletonQuitError as e:
-        print(f"\nError: {e}", file=sys.stderr)
-        print(
+        ableton_process_mod.ensure_ableton_closed(timeout=30.0)
+    except ableton_process_mod.AbletonQuitError as e:
+        print_error(
+            f"\nError: {e}",
             "\nPlease close Ableton Live manually and run this script again.",
-            file=sys.stderr,
-        )
-        print(
             "If you have unsaved work, save it first, then quit Ableton.",
-            file=sys.stderr,
         )
         return 1
 
@@ -188,13 +180,12 @@ After installation, launch Ableton Live to use the MCP server.
         )
         print(f"  Created: {symlink_path} -> {source_path}")
     except InstallationError as e:
-        print(f"\nError: Failed to install Remote Script: {e}", file=sys.stderr)
-        print(
+        print_error(
+            f"\nError: Failed to install Remote Script: {e}",
             "\nPossible causes:",
-            file=sys.stderr,
+            "  - Insufficient permissions to create symlink",
+            "  - User Library folder is read-only",
         )
-        print("  - Insufficient permissions to create symlink", file=sys.stderr)
-        print("  - User Library folder is read-only", file=sys.stderr)
         return 1
 
     # Step 3: Find and modify Preferences.cfg
@@ -202,10 +193,9 @@ After installation, launch Ableton Live to use the MCP server.
     try:
         prefs_path = paths.find_preferences_cfg()
     except AbletonNotFoundError as e:
-        print(f"\nError: {e}", file=sys.stderr)
-        print(
+        print_error(
+            f"\nError: {e}",
             "\nMake sure Ableton Live has been run at least once to create preferences.",
-            file=sys.stderr,
         )
         return 1
 
@@ -226,64 +216,45 @@ After installation, launch Ableton Live to use the MCP server.
             print(f"  Configured Control Surface slot {slot_index + 1}: '{script_name}'")
 
     except NoEmptySlotError:
-        print(
-            f"\nError: No empty control surface slots available.", file=sys.stderr
-        )
-        print(
+        print_error(
+            "\nError: No empty control surface slots available.",
             "\nAll 7 control surface slots are in use. To install this script:",
-            file=sys.stderr,
-        )
-        print(
             "  1. Open Ableton Live",
-            file=sys.stderr,
-        )
-        print(
             "  2. Go to Preferences > Link, Tempo & MIDI",
-            file=sys.stderr,
-        )
-        print(
             "  3. Clear one of the Control Surface slots by setting it to 'None'",
-            file=sys.stderr,
-        )
-        print(
             "  4. Quit Ableton and run this script again",
-            file=sys.stderr,
         )
         return 1
 
     except PreferencesParseError as e:
-        print(
-            f"\nError: Failed to parse Preferences.cfg: {e}", file=sys.stderr
-        )
-        print(
+        print_error(
+            f"\nError: Failed to parse Preferences.cfg: {e}",
             "\nThe preferences file may be corrupted or from an unsupported Ableton version.",
-            file=sys.stderr,
         )
         return 1
 
     except PreferencesWriteError as e:
-        print(
-            f"\nError: Failed to write preferences: {e}", file=sys.stderr
-        )
-        print(
+        print_error(
+            f"\nError: Failed to write preferences: {e}",
             "\nA backup was created. To restore, copy:",
-            file=sys.stderr,
+            f"  {writer.backup_path} -> {prefs_path}",
         )
-        print(f"  {writer.backup_path} -> {prefs_path}", file=sys.stderr)
         return 1
 
     # Success!
-    print("\n" + "=" * 60)
-    print("Installation complete!")
-    print("=" * 60)
-    print("\nNext steps:")
-    print("  1. Launch Ableton Live")
-    print(f"  2. The '{script_name}' control surface should be auto-configured")
-    print("  3. Start the MCP server to connect")
-    print("\nIf you encounter issues:")
-    print("  - Open Preferences > Link, Tempo & MIDI")
-    print(f"  - Verify '{script_name}' appears in a Control Surface slot")
-    print("  - Check that the script folder exists in User Library/Remote Scripts/")
+    print("\n".join([
+        "\n" + "=" * 60,
+        "Installation complete!",
+        "=" * 60,
+        "\nNext steps:",
+        "  1. Launch Ableton Live",
+        f"  2. The '{script_name}' control surface should be auto-configured",
+        "  3. Start the MCP server to connect",
+        "\nIf you encounter issues:",
+        "  - Open Preferences > Link, Tempo & MIDI",
+        f"  - Verify '{script_name}' appears in a Control Surface slot",
+        "  - Check that the script folder exists in User Library/Remote Scripts/",
+    ]))
 
     return 0
 
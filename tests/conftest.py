@@ -7,6 +7,7 @@ Mocks the Ableton Live API boundary:
 """
 
 import sys
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 import pytest
 
@@ -159,10 +160,14 @@ def mcp():
 
     # Browser mock - configure so _find_browser_item_by_uri can find items
     # Create a findable browser item
-    browser_item = MagicMock(spec=['uri', 'name', 'is_loadable'])
-    browser_item.uri = "x"  # matches test param
-    browser_item.name = "Test Item"
-    browser_item.is_loadable = True
+    # Plain data leaf: handlers only read it and pass it to load_item
+    browser_item = SimpleNamespace(
+        uri="x",  # matches test param
+        name="Test Item",
+        is_folder=False,
+        is_device=True,
+        is_loadable=True,
+    )
 
     # Category with children containing our item
     category = MagicMock(spec=['children', 'iter_children'])
@@ -0,0 +1,48 @@
+"""Tests for waiting on Ableton Live to quit.
+
+Process lookups and kqueue are stubbed, so these run on any platform.
+"""
+
+import select
+
+import pytest
+
+from MCP_Server import ableton_process
+from MCP_Server.ableton_process import wait_for_ableton_quit
+from MCP_Server.platform import Platform
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ableton_process.time, "sleep", calls.append)
+    return calls
+
+
+@pytest.fixture
+def kqueue_available(monkeypatch):
+    monkeypatch.setattr(select, "kqueue", object, raising=False)
+    monkeypatch.setattr(ableton_process, "_ableton_pids_macos", lambda: [4242])
+
+
+class TestWaitForQuit:
+    """wait_for_ableton_quit on macOS prefers kqueue over polling."""
+
+    def test_exit_event_skips_polling(self, monkeypatch, sleeps, kqueue_available):
+        monkeypatch.setattr(ableton_process, "_wait_for_exit_kqueue", lambda pids, timeout: True)
+        monkeypatch.setattr(ableton_process, "is_ableton_running", lambda platform: False)
+        assert wait_for_ableton_quit(timeout=5, platform=Platform.MACOS)
+        assert sleeps == []
+
+    def test_kqueue_timeout(self, monkeypatch, sleeps, kqueue_available):
+        monkeypatch.setattr(ableton_process, "_wait_for_exit_kqueue", lambda pids, timeout: False)
+        assert not wait_for_ableton_quit(timeout=5, platform=Platform.MACOS)
+
+    def test_falls_back_to_polling(self, monkeypatch, sleeps, kqueue_available):
+        def unusable(pids, timeout):
+            raise OSError("kqueue unavailable")
+        states = iter([True, False])
+        monkeypatch.setattr(ableton_process, "_wait_for_exit_kqueue", unusable)
+        monkeypatch.setattr(ableton_process, "is_ableton_running", lambda platform: next(states))
+        assert wait_for_ableton_quit(timeout=5, poll_interval=0.25, platform=Platform.MACOS)
+        assert sleeps == [0.25]
@@ -6,8 +6,11 @@ Tests _process_command() with real handlers, mocking only the Ableton API.
 import pytest
 from unittest.mock import MagicMock
 
+from AbletonMCP_Remote_Script import commands
+
 # Command inventories from _process_command()
 DIRECT_COMMANDS = [
+    ("ping", {}),
     ("get_session_info", {}),
     ("get_track_info", {"track_index": 0}),
     ("get_browser_tree", {"category_type": "all"}),
@@ -18,9 +21,13 @@ DIRECT_COMMANDS = [
     ("get_envelope_value_at_time", {"track_index": 0, "clip_index": 0, "device_index": 0, "parameter_index": 0, "time": 0.5}),
     ("get_scenes_info", {}),
     ("get_clip_properties", {"track_index": 0, "clip_index": 0}),
+    ("get_notes_from_clip", {"track_index": 0, "clip_index": 0}),
+    ("get_browser_item", {"uri": "x"}),
     # Transport & timing (read-only)
     ("get_current_time", {}),
     ("get_is_playing", {}),
+    # Batch of read-only commands runs inline as well
+    ("batch", {"commands": [{"type": "get_session_info", "params": {}}]}),
 ]
 
 MAIN_THREAD_COMMANDS = [
@@ -29,14 +36,20 @@ MAIN_THREAD_COMMANDS = [
     ("create_clip", {"track_index": 0, "clip_index": 1, "length": 4.0}),  # slot 1 is empty
     ("add_notes_to_clip", {"track_index": 0, "clip_index": 0, "notes": []}),  # slot 0 has clip
     ("set_clip_name", {"track_index": 0, "clip_index": 0, "name": "Y"}),  # slot 0 has clip
+    ("delete_notes_from_clip", {"track_index": 0, "clip_index": 0, "note_ids": [1]}),
+    ("modify_clip_notes", {"track_index": 0, "clip_index": 0, "modifications": [{"note_id": 1, "velocity": 64}]}),
+    ("transpose_notes_in_clip", {"track_index": 0, "clip_index": 0, "semitones": 12}),
+    ("quantize_notes_in_clip", {"track_index": 0, "clip_index": 0, "grid_size": 0.25}),
     ("set_tempo", {"tempo": 140.0}),
     ("fire_clip", {"track_index": 0, "clip_index": 0}),  # slot 0 has clip
     ("stop_clip", {"track_index": 0, "clip_index": 0}),  # slot 0 has clip
     ("start_playback", {}),
     ("stop_playback", {}),
     ("load_browser_item", {"track_index": 0, "item_uri": "x"}),
+    ("load_drum_kit", {"track_index": 0, "rack_uri": "x", "kit_path": "instruments"}),
     ("set_device_parameter", {"track_index": 0, "device_index": 0, "parameter_index": 0, "value": 0.5}),
     ("batch_set_device_parameters", {"track_index": 0, "device_index": 0, "parameters": []}),
+    ("batch_set_device_parameters_multi", {"updates": [{"track_index": 0, "device_index": 0, "parameters": []}]}),
     ("set_track_volume", {"track_index": 0, "volume": 0.5}),
     ("set_track_pan", {"track_index": 0, "pan": 0.0}),
     ("set_track_mute", {"track_index": 0, "mute": True}),
@@ -63,6 +76,22 @@ MAIN_THREAD_COMMANDS = [
 ]
 
 
+class TestCommandInventory:
+    """The tables above cover the registry, on the thread it declares."""
+
+    def test_every_registered_command_listed(self):
+        listed = {cmd for cmd, _ in DIRECT_COMMANDS + MAIN_THREAD_COMMANDS}
+        assert set(commands._handlers) - listed == set()
+
+    @pytest.mark.parametrize("cmd,params", DIRECT_COMMANDS)
+    def test_direct_commands_not_main_thread(self, cmd, params):
+        assert not commands.requires_main_thread(cmd)
+
+    @pytest.mark.parametrize("cmd,params", MAIN_THREAD_COMMANDS)
+    def test_main_thread_commands_declared(self, cmd, params):
+        assert commands.requires_main_thread(cmd)
+
+
 class TestDirectCommands:
     """Read-only commands execute synchronously, no schedule_message."""
 
@@ -73,10 +102,9 @@ class TestDirectCommands:
 
     @pytest.mark.parametrize("cmd,params", DIRECT_COMMANDS)
     def test_skips_schedule_message(self, mcp, cmd, params):
-        calls = []
-        mcp.schedule_message = lambda d, cb: calls.append(1)
+        mcp.schedule_message = MagicMock()
         mcp._process_command({"type": cmd, "params": params})
-        assert calls == []
+        mcp.schedule_message.assert_not_called()
 
 
 class TestMainThreadCommands:
@@ -89,30 +117,23 @@ class TestMainThreadCommands:
 
     @pytest.mark.parametrize("cmd,params", MAIN_THREAD_COMMANDS)
     def test_uses_schedule_message(self, mcp, cmd, params):
-        calls = []
-        original = mcp.schedule_message
-        mcp.schedule_message = lambda d, cb: (calls.append(1), original(d, cb))[-1]
+        mcp.schedule_message = MagicMock(side_effect=mcp.schedule_message)
         mcp._process_command({"type": cmd, "params": params})
-        assert len(calls) == 1
+        assert mcp.schedule_message.call_count == 1
 
 
 class TestQueueBehavior:
     """The async queue pattern for main-thread commands."""
 
-    def test_timeout_when_callback_not_executed(self, mcp):
+    def test_timeout_when_callback_not_executed(self, mcp, monkeypatch):
         """Queue.get times out if schedule_message doesn't run callback."""
-        import queue as queue_module
-        original_get = queue_module.Queue.get
-
-        def fast_get(self, block=True, timeout=None):
-            return original_get(self, block=block, timeout=0.01)  # 10ms instead of 10s
+        execute = mcp._execute_on_main_thread
+        # Patch this instance only, 10ms instead of 10s
+        monkeypatch.setattr(mcp, "_execute_on_main_thread",
+                            lambda func, timeout=None: execute(func, timeout=0.01))
 
         mcp.schedule_message = lambda d, cb: None
-        queue_module.Queue.get = fast_get
-        try:
-            response = mcp._process_command({"type": "set_tempo", "params": {"tempo": 120}})
-        finally:
-            queue_module.Queue.get = original_get
+        response = mcp._process_command({"type": "set_tempo", "params": {"tempo": 120}})
 
         assert response["status"] == "error"
         assert "Timeout" in response["message"]
@@ -127,6 +148,155 @@ class TestQueueBehavior:
         assert response["status"] == "error"
 
 
+class TestBatch:
+    """The batch command runs sub-commands in order through _process_command."""
+
+    def test_returns_result_per_command(self, mcp):
+        response = mcp._process_command({"type": "batch", "params": {"commands": [
+            {"type": "set_tempo", "params": {"tempo": 90.0}},
+            {"type": "get_session_info", "params": {}},
+        ]}})
+        assert response["status"] == "success"
+        results = response["result"]["results"]
+        assert [r["status"] for r in results] == ["success", "success"]
+        assert response["result"]["executed"] == 2
+
+    def test_stops_on_first_error(self, mcp):
+        response = mcp._process_command({"type": "batch", "params": {"commands": [
+            {"type": "fake_command", "params": {}},
+            {"type": "get_session_info", "params": {}},
+        ]}})
+        result = response["result"]
+        assert result["executed"] == 1
+        assert result["total"] == 2
+        assert result["results"][0]["status"] == "error"
+
+    def test_continues_when_stop_on_error_false(self, mcp):
+        response = mcp._process_command({"type": "batch", "params": {
+            "commands": [
+                {"type": "fake_command", "params": {}},
+                {"type": "get_session_info", "params": {}},
+            ],
+            "stop_on_error": False,
+        }})
+        assert [r["status"] for r in response["result"]["results"]] == ["error", "success"]
+
+    def test_rejects_nested_batch(self, mcp):
+        response = mcp._process_command({"type": "batch", "params": {"commands": [
+            {"type": "batch", "params": {"commands": []}},
+        ]}})
+        assert response["result"]["results"][0]["status"] == "error"
+
+    def test_requires_commands(self, mcp):
+        response = mcp._process_command({"type": "batch", "params": {}})
+        assert response["status"] == "error"
+        assert "commands" in response["message"]
+
+    def test_main_thread_commands_share_one_hop(self, mcp):
+        mcp.schedule_message = MagicMock(side_effect=mcp.schedule_message)
+        response = mcp._process_command({"type": "batch", "params": {"commands": [
+            {"type": "set_tempo", "params": {"tempo": 90.0}},
+            {"type": "start_playback", "params": {}},
+            {"type": "get_session_info", "params": {}},
+        ]}})
+        assert [r["status"] for r in response["result"]["results"]] == ["success"] * 3
+        assert mcp.schedule_message.call_count == 1
+
+
+class TestBatchSetDeviceParametersMulti:
+    """Multi-device parameter updates share one command and undo step."""
+
+    def test_applies_each_update_in_one_undo_step(self, mcp):
+        response = mcp._process_command({"type": "batch_set_device_parameters_multi", "params": {"updates": [
+            {"track_index": 0, "device_index": 0, "parameters": [{"index": 0, "value": 0.25}]},
+            {"track_index": 0, "device_index": 0, "parameters": [{"index": 0, "value": 0.75}]},
+        ]}})
+        assert response["status"] == "success"
+        assert response["result"]["updated_parameters_count"] == 2
+        mcp._song.begin_undo_step.assert_called_once()
+        mcp._song.end_undo_step.assert_called_once()
+
+    def test_bad_device_does_not_abort_others(self, mcp):
+        response = mcp._process_command({"type": "batch_set_device_parameters_multi", "params": {"updates": [
+            {"track_index": 5, "device_index": 0, "parameters": [{"index": 0, "value": 0.5}]},
+            {"track_index": 0, "device_index": 0, "parameters": [{"index": 0, "value": 0.5}]},
+        ]}})
+        results = response["result"]["results"]
+        assert "error" in results[0]
+        assert results[1]["updated_parameters_count"] == 1
+
+    def test_requires_updates(self, mcp):
+        response = mcp._process_command({"type": "batch_set_device_parameters_multi", "params": {}})
+        assert response["status"] == "error"
+        assert "updates" in response["message"]
+
+
+class TestAddNotesColumns:
+    """add_notes_to_clip accepts column-wise notes as well as note dicts."""
+
+    def specs_for(self, mcp, params):
+        import Live
+        spec = Live.Clip.MidiNoteSpecification
+        spec.reset_mock()
+        params = dict({"track_index": 0, "clip_index": 0}, **params)
+        response = mcp._process_command({"type": "add_notes_to_clip", "params": params})
+        assert response["status"] == "success"
+        return [c.kwargs for c in spec.call_args_list]
+
+    def test_columns_match_rows(self, mcp):
+        rows = self.specs_for(mcp, {"notes": [
+            {"pitch": 36, "start_time": 0.0, "duration": 0.5, "velocity": 110, "mute": False},
+            {"pitch": 38, "start_time": 1.0},
+        ]})
+        columns = self.specs_for(mcp, {"note_columns": {
+            "pitch": [36, 38],
+            "start_time": [0.0, 1.0],
+            "duration": [0.5, None],
+            "velocity": [110, None],
+        }})
+        assert columns == rows
+        assert columns[1] == {"pitch": 38, "start_time": 1.0, "duration": 0.25,
+                              "velocity": 100.0, "mute": False}
+
+
+class TestGetNotesById:
+    """get_notes_from_clip reads only the requested notes when given IDs."""
+
+    def test_reads_requested_ids(self, mcp):
+        clip = mcp._song.tracks[0].clip_slots[0].clip
+        note = MagicMock(note_id=7, pitch=60, start_time=0.0, duration=0.25,
+                         velocity=100, mute=False, probability=1.0,
+                         velocity_deviation=0.0, release_velocity=64)
+        clip.get_notes_by_id = MagicMock(return_value=[note])
+        clip.get_notes_extended = MagicMock()
+
+        response = mcp._process_command({"type": "get_notes_from_clip", "params": {
+            "track_index": 0, "clip_index": 0, "note_ids": [7]}})
+
+        assert response["status"] == "success"
+        assert [n["note_id"] for n in response["result"]["notes"]] == [7]
+        clip.get_notes_by_id.assert_called_once_with([7])
+        clip.get_notes_extended.assert_not_called()
+
+
+class TestLoadDrumKit:
+    """load_drum_kit loads the rack and kit in one command."""
+
+    def test_loads_rack_then_kit(self, mcp):
+        response = mcp._process_command({"type": "load_drum_kit", "params": {
+            "track_index": 0, "rack_uri": "x", "kit_path": "instruments"}})
+        assert response["status"] == "success"
+        assert response["result"]["kit_name"] == "Test Item"
+        assert mcp.application().browser.load_item.call_count == 2
+
+    def test_missing_kit_loads_nothing(self, mcp):
+        response = mcp._process_command({"type": "load_drum_kit", "params": {
+            "track_index": 0, "rack_uri": "x", "kit_path": "drums"}})
+        assert response["status"] == "error"
+        assert "No loadable drum kits" in response["message"]
+        mcp.application().browser.load_item.assert_not_called()
+
+
 class TestErrorHandling:
     """Error cases in command dispatch."""
 
@@ -0,0 +1,105 @@
+"""Tests for Remote Script symlink installation.
+
+Uses the macOS layout under a temporary home directory so real symlinks
+are created without touching the user's Ableton folders.
+"""
+
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+from MCP_Server import installer
+from MCP_Server.installer import install_remote_script, is_remote_script_linked
+from MCP_Server.platform import AbletonPaths, Platform
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "home")
+    return AbletonPaths(Platform.MACOS)
+
+
+@pytest.fixture
+def source(tmp_path):
+    src = tmp_path / "AbletonMCP_Remote_Script"
+    src.mkdir()
+    (src / "__init__.py").write_text("")
+    return src
+
+
+class TestInstallIdempotency:
+    """Re-running install on an existing link is a no-op."""
+
+    def test_not_linked_before_install(self, paths, source):
+        assert not is_remote_script_linked(source, "AbletonMCP", paths)
+
+    def test_linked_after_install(self, paths, source):
+        target = install_remote_script(source, "AbletonMCP", paths)
+        assert target.resolve() == source.resolve()
+        assert is_remote_script_linked(source, "AbletonMCP", paths)
+
+    def test_reinstall_keeps_existing_link(self, paths, source, monkeypatch):
+        install_remote_script(source, "AbletonMCP", paths)
+
+        def fail_remove(target):
+            raise AssertionError("existing link should not be removed")
+        monkeypatch.setattr(installer, "_remove_existing", fail_remove)
+
+        install_remote_script(source, "AbletonMCP", paths)
+
+    def test_copied_folder_is_not_linked(self, paths, source):
+        copy = paths.ensure_remote_scripts_dir() / "AbletonMCP"
+        copy.mkdir()
+        assert not is_remote_script_linked(source, "AbletonMCP", paths)
+
+    def test_link_to_other_source_is_replaced(self, paths, source, tmp_path):
+        other = tmp_path / "other"
+        other.mkdir()
+        install_remote_script(other, "AbletonMCP", paths)
+        assert not is_remote_script_linked(source, "AbletonMCP", paths)
+        install_remote_script(source, "AbletonMCP", paths)
+        assert is_remote_script_linked(source, "AbletonMCP", paths)
+
+
+class TestWindowsJunction:
+    """Junctions are created in-process when _winapi is available."""
+
+    def test_uses_create_junction(self, monkeypatch, tmp_path):
+        calls = []
+        winapi = types.ModuleType("_winapi")
+        winapi.CreateJunction = lambda src, dst: calls.append((src, dst))
+        monkeypatch.setitem(sys.modules, "_winapi", winapi)
+
+        def no_spawn(*args, **kwargs):
+            raise AssertionError("mklink should not be spawned")
+        monkeypatch.setattr(installer.subprocess, "run", no_spawn)
+
+        installer._create_junction_windows(tmp_path / "src", tmp_path / "link")
+        assert calls == [(str(tmp_path / "src"), str(tmp_path / "link"))]
+
+    def test_failure_raises_junction_error(self, monkeypatch, tmp_path):
+        def fail(src, dst):
+            raise OSError("Access is denied")
+        winapi = types.ModuleType("_winapi")
+        winapi.CreateJunction = fail
+        monkeypatch.setitem(sys.modules, "_winapi", winapi)
+
+        with pytest.raises(installer.JunctionCreationError, match="Access is denied"):
+            installer._create_junction_windows(tmp_path / "src", tmp_path / "link")
+
+
+class TestPreferencesLookup:
+    """The latest version's Preferences.cfg is located once per paths object."""
+
+    def test_latest_lookup_cached(self, paths, monkeypatch):
+        version = paths.preferences_base / "Live 12.1"
+        version.mkdir(parents=True)
+        (version / "Preferences.cfg").write_bytes(b"")
+        assert paths.find_preferences_cfg() == version / "Preferences.cfg"
+
+        def no_scan():
+            raise AssertionError("preferences folder should not be rescanned")
+        monkeypatch.setattr(paths, "find_latest_version", no_scan)
+        assert paths.find_preferences_cfg() == version / "Preferences.cfg"
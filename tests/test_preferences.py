@@ -0,0 +1,139 @@
+"""Tests for the Preferences.cfg binary parser and writer.
+
+Builds synthetic preferences files with the same layout Ableton writes:
+magic header, MidiOutDevicePreferences marker, zero padding, then the
+21 length-prefixed UTF-16LE control surface strings.
+"""
+
+import struct
+
+import pytest
+
+from MCP_Server import preferences
+from MCP_Server.preferences import (
+    MAGIC_HEADER,
+    MIDI_OUT_DEVICE_PREFS_MARKER,
+    NUM_CONTROL_SURFACE_SLOTS,
+    ControlSurfaceSlotsNotFoundError,
+    PreferencesParser,
+    PreferencesWriteError,
+    PreferencesWriter,
+    _load_preferences,
+)
+
+
+def _utf16(value):
+    return struct.pack("<I", len(value)) + value.encode("utf-16-le")
+
+
+def build_prefs(scripts=None, padding=12):
+    """Build a minimal Preferences.cfg with the given slot script names."""
+    scripts = list(scripts or [])
+    scripts += ["None"] * (NUM_CONTROL_SURFACE_SLOTS - len(scripts))
+    body = b"".join(_utf16(s) + _utf16("None") + _utf16("None") for s in scripts)
+    return (
+        MAGIC_HEADER
+        + b"\x01\x02\x03\x04"
+        + MIDI_OUT_DEVICE_PREFS_MARKER
+        + b"\x00" * padding
+        + body
+    )
+
+
+@pytest.fixture
+def prefs_file(tmp_path):
+    path = tmp_path / "Preferences.cfg"
+    path.write_bytes(build_prefs(["Push2"]))
+    return path
+
+
+class TestParser:
+    """Locating and reading control surface slots."""
+
+    def test_reads_slots(self):
+        parser = PreferencesParser(build_prefs(["Push2", "AbletonMCP"]))
+        assert [s.script_name for s in parser.slots[:3]] == ["Push2", "AbletonMCP", "None"]
+        assert parser.find_empty_slot().index == 2
+
+    @pytest.mark.parametrize("padding", [8, 12, 63, 64, 65, 200])
+    def test_skips_any_padding_length(self, padding):
+        parser = PreferencesParser(build_prefs(["Push2"], padding=padding))
+        assert parser.get_slot(0).script_name == "Push2"
+
+    def test_missing_marker(self):
+        data = build_prefs().replace(MIDI_OUT_DEVICE_PREFS_MARKER, b"X" * 24)
+        with pytest.raises(ControlSurfaceSlotsNotFoundError):
+            PreferencesParser(data)
+
+
+class TestWriter:
+    """Modifying slots on disk."""
+
+    def test_set_control_surface(self, prefs_file):
+        writer = PreferencesWriter(prefs_file)
+        assert writer.set_control_surface("AbletonMCP") == 1
+        assert writer.backup_path.exists()
+        assert PreferencesParser.from_file(prefs_file).get_slot(1).script_name == "AbletonMCP"
+
+    def test_clear_control_surface(self, prefs_file):
+        writer = PreferencesWriter(prefs_file)
+        writer.clear_control_surface(0, create_backup=False)
+        assert PreferencesParser.from_file(prefs_file).get_slot(0).is_empty
+
+    def test_backup_holds_original_contents(self, prefs_file):
+        original = prefs_file.read_bytes()
+        PreferencesWriter(prefs_file).set_control_surface("AbletonMCP")
+        assert (prefs_file.parent / "Preferences.cfg.backup").read_bytes() == original
+        assert sorted(p.name for p in prefs_file.parent.iterdir()) == [
+            "Preferences.cfg", "Preferences.cfg.backup"]
+
+    def test_splices_bytes_already_parsed(self, prefs_file, monkeypatch):
+        writer = PreferencesWriter(prefs_file)
+        reads = []
+        original_read = type(prefs_file).read_bytes
+        monkeypatch.setattr(type(prefs_file), "read_bytes",
+                            lambda self: reads.append(self) or original_read(self))
+        writer.set_control_surface("AbletonMCP", create_backup=False)
+        writer.set_control_surface("Launchpad", create_backup=False)
+        assert len(reads) == 2  # only the post-write verifications
+        slots = PreferencesParser.from_file(prefs_file).slots
+        assert [s.script_name for s in slots[:3]] == ["Push2", "AbletonMCP", "Launchpad"]
+
+    def test_rename_is_synced_to_directory(self, prefs_file, monkeypatch):
+        synced = []
+        monkeypatch.setattr(preferences, "_fsync_directory", synced.append)
+        PreferencesWriter(prefs_file).set_control_surface("AbletonMCP", create_backup=False)
+        assert synced == [prefs_file.parent]
+
+    def test_failed_write_keeps_original(self, prefs_file, monkeypatch):
+        original = prefs_file.read_bytes()
+        writer = PreferencesWriter(prefs_file)
+
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+        monkeypatch.setattr(preferences.os, "replace", fail_replace)
+
+        with pytest.raises(PreferencesWriteError):
+            writer.set_control_surface("AbletonMCP", create_backup=False)
+        assert prefs_file.read_bytes() == original
+        assert not (prefs_file.parent / "Preferences.cfg.tmp").exists()
+
+
+class TestFromFileCache:
+    """from_file reuses parses of unchanged files."""
+
+    def test_unchanged_file_hits_cache(self, prefs_file):
+        _load_preferences.cache_clear()
+        PreferencesParser.from_file(prefs_file)
+        parser = PreferencesParser.from_file(prefs_file)
+        assert _load_preferences.cache_info().hits == 1
+        assert parser.get_slot(0).script_name == "Push2"
+
+    def test_modified_file_is_reparsed(self, prefs_file):
+        PreferencesParser.from_file(prefs_file)
+        prefs_file.write_bytes(build_prefs(["AbletonMCP"]))
+        assert PreferencesParser.from_file(prefs_file).get_slot(0).script_name == "AbletonMCP"
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            PreferencesParser.from_file(tmp_path / "missing.cfg")
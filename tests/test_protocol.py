@@ -0,0 +1,150 @@
+"""Tests for the length-prefixed MCP server protocol.
+
+Uses socket pairs so framing is exercised over real sockets.
+"""
+
+import json
+import socket
+
+import pytest
+
+from MCP_Server import protocol
+from MCP_Server.protocol import (
+    decode_json,
+    encode_json,
+    format_json,
+    enable_keepalive,
+    enable_nodelay,
+    recv_message,
+    send_message,
+)
+
+
+@pytest.fixture
+def sock_pair():
+    a, b = socket.socketpair()
+    yield a, b
+    a.close()
+    b.close()
+
+
+class TestFraming:
+    """send_message / recv_message round-trips."""
+
+    @pytest.mark.parametrize("payload", [
+        {},
+        {"type": "get_session_info", "params": {}},
+        {"notes": [{"pitch": 60, "velocity": 100}] * 500},
+        {"name": "Tëst ✓"},
+    ])
+    def test_round_trip(self, sock_pair, payload):
+        a, b = sock_pair
+        send_message(a, payload)
+        assert recv_message(b) == payload
+
+    def test_length_prefix_is_big_endian(self, sock_pair):
+        a, b = sock_pair
+        send_message(a, [1])
+        assert b.recv(7) == b"\x00\x00\x00\x03[1]"
+
+    def test_round_trip_into_buffer(self, sock_pair):
+        a, b = sock_pair
+        buffer = bytearray(16)
+        send_message(a, {"name": "Tëst"})
+        send_message(a, {"items": list(range(100))})
+        assert recv_message(b, buffer) == {"name": "Tëst"}
+        assert recv_message(b, buffer) == {"items": list(range(100))}
+        assert len(buffer) >= 300  # grown in place for the larger frame
+
+    def test_send_into_buffer_without_sendmsg(self, sock_pair):
+        a, b = sock_pair
+
+        class NoSendmsg:
+            """Socket without sendmsg, as on Windows."""
+            def sendall(self, data):
+                a.sendall(data)
+
+        buffer = bytearray(8)
+        send_message(NoSendmsg(), {"items": list(range(50))}, buffer)
+        send_message(NoSendmsg(), {"a": 1}, buffer)
+        assert recv_message(b) == {"items": list(range(50))}
+        assert recv_message(b) == {"a": 1}
+        assert len(buffer) >= 150  # grown in place for the larger frame
+
+    def test_closed_socket_raises(self, sock_pair):
+        a, b = sock_pair
+        a.close()
+        with pytest.raises(ConnectionError):
+            recv_message(b)
+
+
+class TestRemoteScriptInterop:
+    """The Remote Script's framing matches the server's."""
+
+    def test_remote_to_server(self, sock_pair):
+        from AbletonMCP_Remote_Script import send_message as remote_send
+        a, b = sock_pair
+        remote_send(a, {"status": "success", "result": {"name": "Tëst"}})
+        assert recv_message(b) == {"status": "success", "result": {"name": "Tëst"}}
+
+    def test_server_to_remote(self, sock_pair):
+        from AbletonMCP_Remote_Script import recv_message as remote_recv
+        a, b = sock_pair
+        send_message(a, {"type": "get_session_info", "params": {}})
+        assert remote_recv(b) == {"type": "get_session_info", "params": {}}
+
+    def test_server_to_remote_into_buffer(self, sock_pair):
+        from AbletonMCP_Remote_Script import recv_message as remote_recv
+        a, b = sock_pair
+        buffer = bytearray(16)
+        send_message(a, {"name": "Tëst"})
+        send_message(a, {"items": list(range(100))})
+        assert remote_recv(b, buffer) == {"name": "Tëst"}
+        assert remote_recv(b, buffer) == {"items": list(range(100))}
+        assert len(buffer) >= 300
+
+
+class TestStdlibFallback:
+    """The codec helpers work without orjson installed."""
+
+    @pytest.fixture(autouse=True)
+    def no_orjson(self, monkeypatch):
+        monkeypatch.setattr(protocol, "orjson", None)
+
+    def test_round_trip(self, sock_pair):
+        a, b = sock_pair
+        send_message(a, {"name": "Tëst ✓"})
+        assert recv_message(b, bytearray(8)) == {"name": "Tëst ✓"}
+
+    def test_helpers(self):
+        assert decode_json(memoryview(encode_json({"a": [1]}))) == {"a": [1]}
+        assert decode_json('{"a":"Tëst"}') == {"a": "Tëst"}
+        assert format_json({"a": [1, 2]}) == '{"a":[1,2]}'
+        assert format_json({"a": 1}, pretty=True) == '{\n  "a": 1\n}'
+
+    def test_invalid_json_raises(self):
+        with pytest.raises(json.JSONDecodeError):
+            decode_json(b"{not json")
+
+
+class TestSocketOptions:
+    """Socket tuning helpers."""
+
+    def test_enable_nodelay(self):
+        server = socket.create_server(("127.0.0.1", 0))
+        try:
+            client = socket.create_connection(server.getsockname())
+            try:
+                enable_nodelay(client)
+                assert client.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+            finally:
+                client.close()
+        finally:
+            server.close()
+
+    def test_enable_keepalive(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            enable_keepalive(sock, idle=20)
+            assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+            if hasattr(socket, "TCP_KEEPIDLE"):
+                assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE) == 20
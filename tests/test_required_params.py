@@ -20,6 +20,7 @@ TRACK_REQUIRED = [
     ("fire_clip", {"clip_index": 0}),
     ("stop_clip", {"clip_index": 0}),
     ("load_browser_item", {"item_uri": "test://uri"}),
+    ("load_drum_kit", {"rack_uri": "x", "kit_path": "instruments"}),
     ("get_device_parameters", {"device_index": 0}),
     ("set_device_parameter", {"device_index": 0, "parameter_index": 0, "value": 0.5}),
     ("batch_set_device_parameters", {"device_index": 0, "parameters": []}),
@@ -195,7 +196,7 @@ class TestMissingUri:
         assert response["status"] == "error", (
             f"{cmd} should reject missing item_uri, got: {response}"
         )
-        assert "item_uri" in response["message"].lower() or "uri" in response["message"].lower(), (
+        assert "uri" in response["message"].lower(), (
             f"{cmd} error should mention item_uri: {response['message']}"
         )
 
@@ -0,0 +1,433 @@
+"""Tests for the MCP server: Ableton connection handling, tool wrappers
+and result formatting.
+
+Uses socket pairs or stub connections in place of the Remote Script's
+TCP server.
+"""
+
+import asyncio
+import socket
+import time
+
+import pytest
+
+from MCP_Server import server
+from MCP_Server.protocol import recv_message, send_message
+from MCP_Server.server import (
+    AbletonCommandError,
+    AbletonConnection,
+    _format_browser_tree,
+    _format_template,
+    _notes_to_columns,
+)
+
+
+@pytest.fixture
+def connection():
+    """AbletonConnection wired to one end of a socket pair."""
+    ours, peer = socket.socketpair()
+    conn = AbletonConnection(host="localhost", port=9877, sock=ours)
+    yield conn, peer
+    conn.disconnect()
+    peer.close()
+
+
+class TestIsAlive:
+    """Half-open connection detection."""
+
+    def test_idle_connection_is_alive(self, connection):
+        conn, _ = connection
+        assert conn.is_alive()
+
+    def test_peer_closed(self, connection):
+        conn, peer = connection
+        peer.close()
+        assert not conn.is_alive()
+
+    def test_no_socket(self):
+        assert not AbletonConnection(host="localhost", port=9877).is_alive()
+
+
+class TestCommandErrors:
+    """Error statuses from Ableton."""
+
+    def test_try_command_returns_error_tuple(self, connection):
+        conn, peer = connection
+        send_message(peer, {"status": "error", "message": "Track index out of range"})
+        assert conn.try_command("get_track_info", {"track_index": 9}) == (
+            False, "Track index out of range")
+        assert recv_message(peer)["type"] == "get_track_info"
+
+    def test_try_command_success(self, connection):
+        conn, peer = connection
+        send_message(peer, {"status": "success", "result": {"tempo": 120.0}})
+        assert conn.try_command("get_session_info") == (True, {"tempo": 120.0})
+
+    def test_mismatched_response_id_disconnects(self, connection):
+        conn, peer = connection
+        send_message(peer, {"status": "success", "result": {}, "req_id": 99})
+        with pytest.raises(server.AbletonResponseError, match="out of sync"):
+            conn.try_command("get_session_info")
+        assert conn.sock is None
+
+    def test_matching_response_id(self, connection):
+        conn, peer = connection
+        send_message(peer, {"status": "success", "result": {"tempo": 98.0}, "req_id": 1})
+        assert conn.try_command("get_session_info") == (True, {"tempo": 98.0})
+        assert recv_message(peer)["req_id"] == 1
+
+    def test_ping_accepts_unknown_command(self, connection):
+        conn, peer = connection
+        send_message(peer, {"status": "error", "message": "Unknown command: ping"})
+        conn.ping()
+        assert recv_message(peer)["type"] == "ping"
+
+    def test_send_command_raises(self, connection):
+        conn, peer = connection
+        send_message(peer, {"status": "error", "message": "boom"})
+        with pytest.raises(AbletonCommandError, match="boom"):
+            conn.send_command("get_session_info")
+
+
+class TestStreamedResponses:
+    """Large result lists streamed one frame per item."""
+
+    def test_reassembles_streamed_list(self, connection):
+        from AbletonMCP_Remote_Script import send_streamed
+        conn, peer = connection
+        tree = {"tracks": [{"name": "Bass"}, {"name": "Drums"}], "returns": []}
+        send_streamed(peer, {"status": "success", "result": tree, "req_id": 1}, "tracks")
+        assert conn.try_command("get_session_tree", stream="tracks") == (True, tree)
+        assert recv_message(peer)["stream"] == "tracks"
+
+    def test_more_items_than_one_send(self, connection):
+        from AbletonMCP_Remote_Script import send_streamed
+        conn, peer = connection
+        tree = {"tracks": [{"i": i} for i in range(1200)]}
+        send_streamed(peer, {"status": "success", "result": tree}, "tracks")
+        assert conn.try_command("get_session_tree", stream="tracks") == (True, tree)
+
+    def test_whole_response_still_accepted(self, connection):
+        conn, peer = connection
+        send_message(peer, {"status": "success", "result": {"tracks": [{"name": "Bass"}]}})
+        assert conn.try_command("get_session_tree", stream="tracks") == (
+            True, {"tracks": [{"name": "Bass"}]})
+
+    def test_error_sent_whole(self, connection):
+        from AbletonMCP_Remote_Script import send_streamed
+        conn, peer = connection
+        send_streamed(peer, {"status": "error", "message": "boom"}, "tracks")
+        assert conn.try_command("get_session_tree", stream="tracks") == (False, "boom")
+
+
+class TestFormatTemplate:
+    """Template-based tool result formatters."""
+
+    def test_params_and_result_fields(self):
+        fmt = _format_template("Renamed track {track_index} to {result[name]}")
+        assert fmt({"name": "Bass"}, {"track_index": 2, "name": "bass"}) == "Renamed track 2 to Bass"
+
+    def test_params_take_precedence(self):
+        fmt = _format_template("Set tempo to {tempo} BPM")
+        assert fmt({"tempo": 120.0}, {"tempo": 98}) == "Set tempo to 98 BPM"
+
+    def test_cached_per_template(self):
+        assert _format_template("{x}") is _format_template("{x}")
+
+
+class TestTrackFormatters:
+    """A result without a name still reports the mutation as done."""
+
+    @pytest.fixture
+    def nameless(self, monkeypatch):
+        class Stub:
+            def try_command(self, command_type, params=None, stream=None):
+                return True, {"index": 0}
+        monkeypatch.setattr(server, "get_ableton_connection", Stub)
+        server._invalidate_cache()
+
+    def test_create_midi_track(self, nameless):
+        assert asyncio.run(server.create_midi_track(None)) == "Created new MIDI track: unknown"
+
+    def test_set_track_name_falls_back_to_param(self, nameless):
+        assert asyncio.run(server.set_track_name(None, track_index=0, name="Bass")) == (
+            "Renamed track to: Bass")
+
+
+class TestFormatBrowserTree:
+    """Browser tree rendering."""
+
+    def test_nested_order_and_markers(self):
+        tree = [{
+            "name": "Drums", "path": "drums", "children": [
+                {"name": "Kits", "path": "drums/Kits", "has_more": True},
+                {"name": "Hits", "children": [{"name": "Snare"}]},
+            ],
+        }, {}]
+        assert _format_browser_tree(tree) == (
+            "• Drums (path: drums)\n"
+            "  • Kits (path: drums/Kits) [...]\n"
+            "  • Hits\n"
+            "    • Snare\n"
+            "\n"
+            "\n"
+        )
+
+    def test_deep_tree_does_not_recurse(self):
+        root = node = {"name": "0"}
+        for i in range(1, 5000):
+            node["children"] = [{"name": str(i)}]
+            node = node["children"][0]
+        assert _format_browser_tree([root]).count("•") == 5000
+
+
+class TestNotesToColumns:
+    """Column-wise note encoding for add_notes_to_clip."""
+
+    def test_one_list_per_field(self):
+        notes = [{"pitch": 60, "start_time": 0.0, "duration": 1.0, "velocity": 90, "mute": False},
+                 {"pitch": 64, "start_time": 1.0}]
+        assert _notes_to_columns(notes) == {
+            "pitch": [60, 64],
+            "start_time": [0.0, 1.0],
+            "duration": [1.0, None],
+            "velocity": [90, None],
+            "mute": [False, None],
+        }
+
+
+class TestThreadedTools:
+    """Tool round-trips run off the event loop."""
+
+    class SlowAbleton:
+        def try_command(self, command_type, params=None, stream=None):
+            time.sleep(0.05)
+            return True, {"tempo": params["tempo"]}
+
+    def test_tool_is_async_and_formats(self, monkeypatch):
+        monkeypatch.setattr(server, "get_ableton_connection", self.SlowAbleton)
+        assert asyncio.iscoroutinefunction(server.set_tempo)
+        assert asyncio.run(server.set_tempo(None, tempo=98)) == "Set tempo to 98 BPM"
+
+    def test_event_loop_not_blocked(self, monkeypatch):
+        monkeypatch.setattr(server, "get_ableton_connection", self.SlowAbleton)
+        events = []
+
+        async def tool():
+            await server.set_tempo(None, tempo=98)
+            events.append("tool")
+
+        async def ticker():
+            await asyncio.sleep(0.01)
+            events.append("tick")
+
+        async def run():
+            await asyncio.gather(tool(), ticker())
+
+        asyncio.run(run())
+        assert events == ["tick", "tool"]
+
+    def test_error_status_message(self, monkeypatch):
+        class FailingAbleton:
+            def try_command(self, command_type, params=None, stream=None):
+                return False, "Clip slot is empty"
+
+        monkeypatch.setattr(server, "get_ableton_connection", FailingAbleton)
+        assert asyncio.run(server.fire_clip(None, track_index=0, clip_index=3)) == (
+            "Error fire clip: Clip slot is empty")
+
+
+class TestBrowserErrors:
+    """Browser tools share one error-to-hint mapping."""
+
+    @pytest.mark.parametrize("tool,params,context", [
+        ("get_browser_tree", {}, "getting browser tree"),
+        ("get_browser_items_at_path", {"path": "drums"}, "getting browser items at path"),
+    ])
+    def test_hint_and_fallback(self, monkeypatch, tool, params, context):
+        messages = iter(["Browser is not available", "boom"])
+
+        def failing():
+            raise RuntimeError(next(messages))
+        monkeypatch.setattr(server, "get_ableton_connection", failing)
+        server._invalidate_cache()
+        assert asyncio.run(getattr(server, tool)(None, **params)).startswith(
+            "Error: The Ableton browser is not available.")
+        assert asyncio.run(getattr(server, tool)(None, **params)) == f"Error {context}: boom"
+
+
+class TestResponseCache:
+    """Tree queries are cached until a modifying tool runs."""
+
+    class CountingAbleton:
+        def __init__(self):
+            self.sent = []
+
+        def send_command(self, command_type, params=None, stream=None):
+            self.sent.append(command_type)
+            return {"command": command_type}
+
+        def try_command(self, command_type, params=None, stream=None):
+            return True, self.send_command(command_type, params)
+
+    @pytest.fixture
+    def ableton(self, monkeypatch):
+        stub = self.CountingAbleton()
+        monkeypatch.setattr(server, "get_ableton_connection", lambda: stub)
+        server._invalidate_cache()
+        yield stub
+        server._invalidate_cache()
+
+    def test_session_tree_reused(self, ableton):
+        asyncio.run(server.get_session_tree(None))
+        asyncio.run(server.get_session_tree(None))
+        asyncio.run(server.get_track_info(None, track_index=0))
+        asyncio.run(server.get_session_tree(None))
+        assert ableton.sent.count("get_session_tree") == 1
+
+    def test_modifying_tool_invalidates(self, ableton):
+        asyncio.run(server.get_session_tree(None))
+        asyncio.run(server.set_tempo(None, tempo=100))
+        asyncio.run(server.get_session_tree(None))
+        assert ableton.sent.count("get_session_tree") == 2
+
+    def test_session_tree_expires(self, ableton):
+        asyncio.run(server.get_session_tree(None))
+        # Age the entry past SESSION_TREE_CACHE_TTL
+        server._response_cache.update(
+            {k: (v[0] - 60, v[1]) for k, v in server._response_cache.items()})
+        asyncio.run(server.get_session_tree(None))
+        assert ableton.sent.count("get_session_tree") == 2
+
+    def test_track_info_keyed_on_params(self, ableton):
+        asyncio.run(server.get_track_info(None, track_index=0))
+        asyncio.run(server.get_track_info(None, track_index=0))
+        asyncio.run(server.get_track_info(None, track_index=1))
+        assert ableton.sent.count("get_track_info") == 2
+
+    def test_browser_tree_keyed_on_params(self, ableton):
+        asyncio.run(server.get_browser_tree(None, category_type="drums"))
+        asyncio.run(server.get_browser_tree(None, category_type="drums"))
+        asyncio.run(server.get_browser_tree(None, category_type="instruments"))
+        assert ableton.sent.count("get_browser_tree") == 2
+
+    def test_browser_tree_expires(self, ableton):
+        asyncio.run(server.get_browser_tree(None, category_type="drums"))
+        # Age the entry past BROWSER_CACHE_TTL
+        server._response_cache.update(
+            {k: (v[0] - 60, v[1]) for k, v in server._response_cache.items()})
+        asyncio.run(server.get_browser_tree(None, category_type="drums"))
+        assert ableton.sent.count("get_browser_tree") == 2
+
+    def test_browser_items_reused(self, ableton):
+        asyncio.run(server.get_browser_items_at_path(None, path="drums"))
+        asyncio.run(server.get_browser_items_at_path(None, path="drums"))
+        assert ableton.sent.count("get_browser_items_at_path") == 1
+
+    def test_browser_items_expire(self, ableton):
+        asyncio.run(server.get_browser_items_at_path(None, path="drums"))
+        server._response_cache.update(
+            {k: (v[0] - 60, v[1]) for k, v in server._response_cache.items()})
+        asyncio.run(server.get_browser_items_at_path(None, path="drums"))
+        assert ableton.sent.count("get_browser_items_at_path") == 2
+
+
+class TestPreconnect:
+    """Startup connection to an already-running Ableton."""
+
+    class StubConnection:
+        accepting = True
+
+        def __init__(self, host, port):
+            self.sent = []
+
+        def connect(self):
+            return self.accepting
+
+        def ping(self, timeout=None):
+            self.sent.append(("ping", timeout))
+
+        def disconnect(self):
+            pass
+
+    @pytest.fixture(autouse=True)
+    def no_connection(self, monkeypatch):
+        monkeypatch.setattr(server, "_ableton_connection", None)
+
+    def test_caches_validated_connection(self, monkeypatch):
+        monkeypatch.setattr(server, "AbletonConnection", self.StubConnection)
+        server._preconnect()
+        assert server._ableton_connection.sent == [("ping", server.HEARTBEAT_TIMEOUT)]
+
+    def test_leaves_lazy_path_when_refused(self, monkeypatch):
+        stub = type("Refused", (self.StubConnection,), {"accepting": False})
+        monkeypatch.setattr(server, "AbletonConnection", stub)
+        server._preconnect()
+        assert server._ableton_connection is None
+
+
+class TestEagerLaunch:
+    """Opt-in launch of Ableton at server startup."""
+
+    def test_connects_under_lock(self, monkeypatch):
+        held = []
+        monkeypatch.setattr(server, "get_ableton_connection",
+                            lambda: held.append(server._ableton_lock.locked()))
+        server._eager_launch()
+        assert held == [True]
+        assert not server._ableton_lock.locked()
+
+    def test_failure_left_to_first_tool_call(self, monkeypatch):
+        def fail():
+            raise RuntimeError("Failed to launch Ableton Live")
+        monkeypatch.setattr(server, "get_ableton_connection", fail)
+        server._eager_launch()
+        assert not server._ableton_lock.locked()
+
+
+class TestHeartbeat:
+    """Background pings keep the idle connection usable."""
+
+    class StubConnection:
+        def __init__(self, fails=False):
+            self.sock = object()
+            self.fails = fails
+            self.pinged = False
+
+        def ping(self, timeout=None):
+            self.pinged = True
+            if self.fails:
+                raise ConnectionError("peer gone")
+
+        def disconnect(self):
+            self.sock = None
+
+    def test_healthy_connection_kept(self, monkeypatch):
+        stub = self.StubConnection()
+        monkeypatch.setattr(server, "_ableton_connection", stub)
+        server._heartbeat_once()
+        assert stub.pinged and server._ableton_connection is stub
+
+    def test_failed_ping_reconnects(self, monkeypatch):
+        stub = self.StubConnection(fails=True)
+        monkeypatch.setattr(server, "_ableton_connection", stub)
+        reconnects = []
+        monkeypatch.setattr(server, "_preconnect", lambda: reconnects.append(1))
+        server._heartbeat_once()
+        assert stub.sock is None and server._ableton_connection is None
+        assert reconnects == [1]
+
+    def test_reconnect_clears_cache(self, monkeypatch):
+        monkeypatch.setattr(server, "_ableton_connection", self.StubConnection(fails=True))
+        monkeypatch.setattr(server, "AbletonConnection", TestPreconnect.StubConnection)
+        monkeypatch.setitem(server._response_cache, "get_browser_tree:{}", (0.0, {}))
+        server._heartbeat_once()
+        assert isinstance(server._ableton_connection, TestPreconnect.StubConnection)
+        assert server._response_cache == {}
+
+    def test_skipped_while_tool_runs(self, monkeypatch):
+        stub = self.StubConnection()
+        monkeypatch.setattr(server, "_ableton_connection", stub)
+        with server._ableton_lock:
+            server._heartbeat_once()
+        assert not stub.pinged